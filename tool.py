@@ -1,45 +1,563 @@
 # -*- coding: utf-8 -*-
 import sys
 import os
+import re
 import json
 import time
+import logging
+import threading
+import itertools
+import difflib
+from dataclasses import dataclass
+from enum import IntFlag, auto
 from datetime import datetime
-from PyQt5.QtCore import Qt, QRunnable, QThreadPool, pyqtSignal, QObject, QTimer
+from functools import lru_cache, partial
+from PyQt5.QtCore import (
+    Qt, QRunnable, QThread, QThreadPool, pyqtSignal, QObject, QTimer,
+    QAbstractTableModel, QAbstractListModel, QModelIndex
+)
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
-    QListWidget, QListWidgetItem, QTextEdit, QFileDialog,
+    QListWidget, QListWidgetItem, QListView, QTextEdit, QPlainTextEdit, QFileDialog,
     QMessageBox, QInputDialog, QLabel, QGroupBox, QSplitter,
-    QTableWidget, QTableWidgetItem, QHeaderView, QComboBox, QLineEdit,
-    QAbstractItemView, QFormLayout, QDialog, QTabWidget, QTextBrowser,
-    QMenu, QAction, QCheckBox, QProgressBar, QDialogButtonBox
+    QTableView, QHeaderView, QComboBox, QLineEdit,
+    QAbstractItemView, QDialog, QMenu, QAction, QCheckBox
+)
+from PyQt5.QtGui import (
+    QColor, QFont, QSyntaxHighlighter, QTextCharFormat, QTextCursor, QStandardItem,
+    QStandardItemModel
 )
-from PyQt5.QtGui import QColor, QFont
 from git import Repo, InvalidGitRepositoryError, GitCommandError, RemoteProgress
 
+try:
+    import orjson
+except ImportError:  # orjson 为可选依赖，未安装时使用标准库 json
+    orjson = None
+
 CONFIG_FILE = "git_repos.json"
+# 仓库列表的变更日志：每次增删立即追加一行，下次完整写入配置前崩溃也不会丢失
+CONFIG_JOURNAL_FILE = CONFIG_FILE + ".log"
+
+# 默认不输出日志，设置环境变量 GIT_GUI_DEBUG 后输出调试信息
+log = logging.getLogger('git_gui')
+log.addHandler(logging.NullHandler())
+
+# git status --porcelain 暂存区状态码到 (状态, 图标) 的映射
+_STATUS_MAP = {
+    'A': ("已暂存", "✅"),
+    'M': ("修改", "📝"),
+    'D': ("删除", "❌"),
+}
+_STATUS_DEFAULT = ("未暂存", "📝")
+# 可查看差异的文件状态 -> 是否为未跟踪文件（决定差异的生成方式）
+_DIFF_STATUSES = {"未暂存": False, "修改": False, "未跟踪": True}
+# 可取消变更的文件状态
+_REVERTIBLE_STATUSES = frozenset(("未暂存", "修改"))
+# 只读 git 命令的附加环境变量：不获取可选锁（等同 --no-optional-locks，status 不再顺带
+# 刷新 index），也不在后台线程中弹出凭据提示
+_READ_ONLY_GIT_ENV = {"GIT_OPTIONAL_LOCKS": "0", "GIT_TERMINAL_PROMPT": "0"}
+# 提交详情的 diff-tree 另需原样输出非 ASCII 路径（core.quotepath=false）；经环境变量按次传入，
+# 不使用 repo.git(c=...)，后者把选项存放在各线程共用的 Git 对象上
+_COMMIT_VIEW_GIT_ENV = {**_READ_ONLY_GIT_ENV, "GIT_CONFIG_COUNT": "1",
+                        "GIT_CONFIG_KEY_0": "core.quotepath", "GIT_CONFIG_VALUE_0": "false"}
+# porcelain v2 各类记录中路径之前的字段数：普通变更、重命名/复制、未合并
+_PORCELAIN_V2_FIELDS = {'1': 8, '2': 9, 'u': 10}
+# status 结果缓存的最长复用时间（秒），index 未变化时工作区文件仍可能被修改
+_STATUS_CACHE_TTL = 2.0
+# 超过该文件数时按批次发送解析进度
+_STATUS_PROGRESS_THRESHOLD = 5000
+_STATUS_PROGRESS_BATCH = 1000
+# git log 输出格式：完整哈希、作者、提交时间（ISO 8601）、标题，以 \x1f 分隔
+_LOG_FORMAT = '%H%x1f%an%x1f%cI%x1f%s'
+# 提交历史每次加载的提交数
+_LOG_PAGE_SIZE = 200
+# 远程操作进度的最小发送间隔（秒）与显示格式
+_PROGRESS_INTERVAL = 1.0
+_PROGRESS_FORMAT = "%s: %d%%"
+# 提交完成的提示；提交并推送时界面据此判断推送失败前提交是否已完成
+_COMMIT_DONE_FORMAT = "提交成功: %s"
+# 远程操作各阶段的显示名称（RemoteProgress 的阶段码）
+_PROGRESS_PHASES = {
+    RemoteProgress.COUNTING: "统计对象",
+    RemoteProgress.COMPRESSING: "压缩对象",
+    RemoteProgress.WRITING: "写入对象",
+    RemoteProgress.RECEIVING: "接收对象",
+    RemoteProgress.RESOLVING: "处理差异",
+    RemoteProgress.FINDING_SOURCES: "查找来源",
+    RemoteProgress.CHECKING_OUT: "检出文件",
+}
+# 结果在GUI端按 .git 文件修改时间缓存的查询操作，以及缓存的最长复用时间（秒）
+_CACHED_QUERIES = frozenset(("branches", "log"))
+_QUERY_CACHE_TTL = 30.0
+# 不修改仓库的操作，其余操作完成后丢弃查询缓存
+_READ_ONLY_OPERATIONS = frozenset(("open", "status", "log", "branches", "show_commit", "diff"))
+# 待刷新的界面区域（可按位组合）与合并刷新请求的延迟（毫秒）
+_REFRESH_BRANCHES = 1
+_REFRESH_STATUS = 2
+_REFRESH_HISTORY = 4
+_REFRESH_ALL = _REFRESH_BRANCHES | _REFRESH_STATUS | _REFRESH_HISTORY
+_REFRESH_DELAY_MS = 150
+# GUI 端文件差异的缓存时间（秒）
+_DIFF_CACHE_TTL = 30.0
+# 差异输出按块发送到界面，每块的大致字节数；超过上限的差异不再缓存
+_DIFF_CHUNK_SIZE = 64 * 1024
+_DIFF_CACHE_MAX_CHARS = 1024 * 1024
+# 不超过该大小的文本文件在进程内与 HEAD 比较，更大的文件交给 git diff
+_INPROCESS_DIFF_MAX_BYTES = 256 * 1024
+# 仓库路径存在性检查结果的缓存时间（秒）
+_EXISTS_CACHE_TTL = 5.0
+# 合并多次配置保存请求的延迟（毫秒），期间的变更已记入变更日志
+_SAVE_DELAY_MS = 2000
+# 日志区域保留的最大行数
+_LOG_MAX_LINES = 500
+# 在独立线程池中执行的网络操作
+_NETWORK_OPERATIONS = frozenset(("push", "push_with_upstream", "pull", "add_commit_push"))
+# 线程池中排队任务的优先级（越大越先执行）：写操作优先于查询，差异预览最后，
+# 避免连续查看差异时撤销变更、删除分支等写操作长时间排队
+_OPERATION_PRIORITY = {
+    "diff": 1,
+    "show_commit": 2,
+    "open": 3,
+    "status": 3,
+    "log": 3,
+    "branches": 3,
+    "checkout_file": 8,
+    "delete_branch": 8,
+}
+_DEFAULT_PRIORITY = 5
+# 差异行高亮颜色（前景色, 背景色）：新增行、删除行与 @@ 区块头
+_DIFF_LINE_COLORS = {
+    '+': ("green", "#f0fff0"),
+    '-': ("red", "#fff0f0"),
+    '@': ("blue", "#f0f0ff"),
+}
+# 打开仓库时写入的HTTP配置：低速超时，以及避免大推送时 RPC 失败的缓冲区大小
+_HTTP_OPTIONS = (
+    ('lowSpeedLimit', '1000'),
+    ('lowSpeedTime', '30'),
+    ('postBuffer', '524288000'),
+)
+# 克隆选项：默认为不下载历史文件内容的部分克隆（用到时按需获取），保留完整提交历史与分支；
+# 浅克隆另外只取默认分支的最新提交，不含标签
+_CLONE_OPTIONS = {'filter': 'blob:none'}
+_SHALLOW_CLONE_OPTIONS = {'depth': 1, 'single_branch': True, 'no_tags': True}
+
+
+class Op(IntFlag):
+    """界面操作标记，每个操作占一位，用于防止重复触发"""
+    ADD_REPO = auto()
+    REMOVE_REPO = auto()
+    CLONE_REPO = auto()
+    REFRESH_STATUS = auto()
+    STAGE_ALL = auto()
+    COMMIT = auto()
+    COMMIT_AND_PUSH = auto()
+    PULL = auto()
+    PUSH = auto()
+    CREATE_BRANCH = auto()
+    MERGE_BRANCH = auto()
+    SWITCH_BRANCH = auto()
+    CHERRY_PICK = auto()
+    SHOW_COMMIT = auto()
+
+
+def _dumps_json(obj, indent=True):
+    """序列化为 UTF-8 编码的 JSON 字节串，indent 为假时输出单行"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None).encode('utf-8')
+
+
+def _loads_json(data):
+    """解析 JSON 字节串"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class _ConfigWriter:
+    """写入仓库配置文件；后台写入与退出时的同步写入串行执行，且旧数据不会覆盖新数据"""
+
+    _lock = threading.Lock()
+    _written = 0
+
+    @classmethod
+    def write(cls, repo_paths, generation):
+        with cls._lock:
+            if generation < cls._written:
+                return
+            # 先写临时文件再原子替换，避免写入中途崩溃损坏配置
+            tmp_path = CONFIG_FILE + ".tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(_dumps_json(repo_paths))
+            os.replace(tmp_path, CONFIG_FILE)
+            cls._written = generation
+
+    @staticmethod
+    def append_journal(op, path):
+        """向变更日志追加一条记录（op 为 "add" 或 "remove"），单次追加写入不会与其他记录交错"""
+        fd = os.open(CONFIG_JOURNAL_FILE, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, _dumps_json({"op": op, "path": path}, indent=False) + b'\n')
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def replay_journal(repo_paths):
+        """把变更日志按顺序应用到仓库列表上，返回是否存在日志记录"""
+        try:
+            with open(CONFIG_JOURNAL_FILE, 'rb') as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return False
+        for line in lines:
+            try:
+                entry = _loads_json(line)
+            except ValueError:
+                # 崩溃时最后一行可能未写完整
+                continue
+            path = entry.get("path")
+            if entry.get("op") == "add" and path not in repo_paths:
+                repo_paths.append(path)
+            elif entry.get("op") == "remove" and path in repo_paths:
+                repo_paths.remove(path)
+        return bool(lines)
+
+    @classmethod
+    def compact(cls, repo_paths, generation):
+        """同步写入完整配置并清空变更日志"""
+        cls.write(repo_paths, generation)
+        try:
+            os.remove(CONFIG_JOURNAL_FILE)
+        except FileNotFoundError:
+            pass
+
+
+class _RepoCache:
+    """按路径缓存 Repo 对象，避免每次操作都重新初始化仓库"""
+
+    _repos = {}
+    _configured = set()
+    _odb_locks = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls, path):
+        with cls._lock:
+            repo = cls._repos.get(path)
+            if repo is None:
+                repo = Repo(path)
+                cls._repos[path] = repo
+                if path not in cls._configured:
+                    cls._apply_http_options(repo)
+                    cls._configured.add(path)
+            return repo
+
+    @classmethod
+    def odb_lock(cls, repo):
+        """返回仓库对象库的锁：Repo 常驻的 cat-file 进程一次只能处理一个线程的请求"""
+        with cls._lock:
+            return cls._odb_locks.setdefault(repo.git_dir, threading.Lock())
+
+    @staticmethod
+    def _apply_http_options(repo):
+        """在仓库配置中写入远程操作的HTTP优化选项（已是目标值时不写入）"""
+        try:
+            reader = repo.config_reader('repository')
+            missing = [(option, value) for option, value in _HTTP_OPTIONS
+                       if str(reader.get_value('http', option, '')) != value]
+            if missing:
+                with repo.config_writer() as writer:
+                    for option, value in missing:
+                        writer.set_value('http', option, value)
+        except Exception as e:
+            log.warning('设置仓库HTTP配置失败: %s', e)
+
+    @classmethod
+    def put(cls, path, repo):
+        with cls._lock:
+            cls._repos[path] = repo
+            if path not in cls._configured:
+                cls._apply_http_options(repo)
+                cls._configured.add(path)
+
+    @classmethod
+    def invalidate(cls, path):
+        """丢弃缓存的 Repo，下次使用时重新打开以刷新分支和引用状态"""
+        with cls._lock:
+            cls._repos.pop(path, None)
+
+    @classmethod
+    def close_all(cls):
+        """关闭所有缓存的 Repo，结束其常驻的 git cat-file 进程"""
+        with cls._lock:
+            repos = list(cls._repos.values())
+            cls._repos.clear()
+        for repo in repos:
+            try:
+                repo.close()
+            except Exception as e:
+                log.warning('关闭仓库失败: %s', e)
+
+
+class _StatusCache:
+    """缓存 status 解析结果，index 与 HEAD 的修改时间不变时直接复用"""
+
+    _entries = {}
+    _generations = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def stamp(git_dir):
+        """读取 index 与 HEAD 的修改时间作为缓存键"""
+        stamp = []
+        for name in ('index', 'HEAD'):
+            try:
+                stamp.append(os.stat(os.path.join(git_dir, name)).st_mtime_ns)
+            except OSError:
+                stamp.append(None)
+        return tuple(stamp)
+
+    @classmethod
+    def get(cls, path, stamp):
+        with cls._lock:
+            entry = cls._entries.get(path)
+        if entry is None:
+            return None
+        cached_stamp, cached_at, result = entry
+        if cached_stamp != stamp or time.monotonic() - cached_at > _STATUS_CACHE_TTL:
+            return None
+        return result
+
+    @classmethod
+    def generation(cls, path):
+        """返回仓库当前的失效代数，执行 git status 前记录"""
+        with cls._lock:
+            return cls._generations.get(path, 0)
+
+    @classmethod
+    def put(cls, path, stamp, result, generation):
+        with cls._lock:
+            # 执行期间缓存已被写操作作废，结果可能过期，不再写入
+            if cls._generations.get(path, 0) != generation:
+                return
+            cls._entries[path] = (stamp, time.monotonic(), result)
+
+    @classmethod
+    def invalidate(cls, path):
+        """丢弃缓存的状态，下次刷新时重新执行 git status"""
+        with cls._lock:
+            cls._entries.pop(path, None)
+            cls._generations[path] = cls._generations.get(path, 0) + 1
+
+
+@dataclass(slots=True)
+class CommitRow:
+    """提交历史中的一行"""
+    hash: str
+    message: str
+    author: str
+    date: str
+    full_hash: str
+
+
+# 整体 diff 中每个文件差异的起始行
+_DIFF_FILE_RE = re.compile(r'^diff --git a/(.+?) b/(.+)$', re.MULTILINE)
+
+
+def _split_diff_by_file(full_diff):
+    """把整体差异按文件拆分为 {路径: 该文件的差异}"""
+    per_file = {}
+    matches = list(_DIFF_FILE_RE.finditer(full_diff))
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(full_diff)
+        body = full_diff[match.start():end].rstrip('\n')
+        per_file.setdefault(match.group(2), body)
+        per_file.setdefault(match.group(1), body)
+    return per_file
+
+
+def _untracked_file_diff(work_dir, file_path):
+    """未跟踪文件的差异：在进程内读取文件，全部显示为新增行（git diff 对其没有输出）。
+    文件较大时返回 None，由 git diff --no-index 分块输出"""
+    full_path = os.path.join(work_dir, file_path)
+    file_stat = os.stat(full_path)
+    if file_stat.st_size > _INPROCESS_DIFF_MAX_BYTES:
+        return None
+    mode = '100755' if file_stat.st_mode & 0o111 else '100644'
+    with open(full_path, 'rb') as f:
+        data = f.read()
+
+    header = f"diff --git a/{file_path} b/{file_path}\nnew file mode {mode}"
+    # 与 git 相同，前 8000 字节中出现 NUL 即视为二进制文件
+    if b'\0' in data[:8000]:
+        return f"{header}\nBinary files /dev/null and b/{file_path} differ"
+    if not data:
+        return header
+    # 按字节中的 \n 分行后再解码，行数与 git 的 hunk 头一致（str.splitlines 还会在 \f、U+2028 等处分行）
+    lines = data.split(b'\n')
+    missing_newline = lines[-1] != b''
+    if not missing_newline:
+        lines.pop()
+    body = '\n'.join('+' + line.decode('utf-8', errors='replace') for line in lines)
+    if missing_newline:
+        body += '\n\\ No newline at end of file'
+    return f"{header}\n--- /dev/null\n+++ b/{file_path}\n@@ -0,0 +1,{len(lines)} @@\n{body}"
+
+
+def _has_attributes(repo, file_path):
+    """文件是否可能受 gitattributes 影响（换行转换、过滤器、textconv 等）：
+    检查文件所在目录至仓库根目录的 .gitattributes、$GIT_DIR/info/attributes 与全局属性文件"""
+    directory = os.path.dirname(file_path)
+    while True:
+        if os.path.exists(os.path.join(repo.working_dir, directory, '.gitattributes')):
+            return True
+        if not directory:
+            break
+        directory = os.path.dirname(directory)
+    if os.path.exists(os.path.join(repo.common_dir, 'info', 'attributes')):
+        return True
+    try:
+        global_file = str(repo.config_reader().get_value('core', 'attributesFile', ''))
+    except Exception:
+        return True
+    if not global_file:
+        # 未配置时 git 读取 $XDG_CONFIG_HOME/git/attributes
+        config_home = os.environ.get('XDG_CONFIG_HOME') or os.path.join('~', '.config')
+        global_file = os.path.join(config_home, 'git', 'attributes')
+    return os.path.exists(os.path.expanduser(global_file))
+
+
+def _tracked_file_diff(repo, file_path):
+    """已跟踪文件相对 HEAD 的差异：HEAD 中的内容经仓库常驻的 cat-file 进程读取，在进程内比较。
+    文件不在 HEAD 中、较大、为二进制或可能经过换行/过滤转换时返回 None，由 git diff 处理"""
+    if _has_attributes(repo, file_path):
+        return None
+    odb_lock = _RepoCache.odb_lock(repo)
+    try:
+        with odb_lock:
+            blob = repo.head.commit.tree / file_path
+            if blob.type != 'blob':
+                return None
+            # 大小按需经 cat-file --batch-check 读取，同样需要在锁内完成
+            blob_mode, blob_size = blob.mode, blob.size
+    except (KeyError, ValueError):
+        return None
+    if blob_mode == blob.link_mode or blob_size > _INPROCESS_DIFF_MAX_BYTES:
+        return None
+
+    full_path = os.path.join(repo.working_dir, file_path)
+    try:
+        file_stat = os.stat(full_path)
+        # 大文件与可执行位变化（git 会输出 old mode/new mode）交给 git diff
+        if (file_stat.st_size > _INPROCESS_DIFF_MAX_BYTES
+                or bool(file_stat.st_mode & 0o111) != (blob_mode == 0o100755)):
+            return None
+        with open(full_path, 'rb') as f:
+            new_data = f.read()
+        deleted = False
+    except FileNotFoundError:
+        new_data = b''
+        deleted = True
+    with odb_lock:
+        old_data = blob.data_stream.read()
+
+    # 二进制内容与 CRLF 换行（可能涉及 autocrlf 转换）交给 git 处理
+    if b'\0' in old_data[:8000] or b'\0' in new_data[:8000] or b'\r' in old_data or b'\r' in new_data:
+        return None
+    # 缺少末尾换行时需要 git 的 "\ No newline at end of file" 标记，splitlines 无法区分
+    if (old_data and not old_data.endswith(b'\n')) or (new_data and not new_data.endswith(b'\n')):
+        return None
+    # 按字节中的 \n 分行后再解码：str.splitlines 还会在 \f、\v、U+2028 等字符处分行，与 git 不一致
+    old_lines = [line.decode('utf-8', errors='replace') for line in old_data.split(b'\n')[:-1]]
+    new_lines = [line.decode('utf-8', errors='replace') for line in new_data.split(b'\n')[:-1]]
+    if not deleted and old_data == new_data:
+        return ""
+
+    header = f"diff --git a/{file_path} b/{file_path}"
+    if deleted:
+        header += f"\ndeleted file mode {blob_mode:o}"
+    body = '\n'.join(difflib.unified_diff(old_lines, new_lines, f"a/{file_path}",
+                                          "/dev/null" if deleted else f"b/{file_path}", lineterm=''))
+    return f"{header}\n{body}" if body else header
+
+
+@lru_cache(maxsize=256)
+def _build_commit_view(repo_path, commit_hash):
+    """组装提交详情（提交不可变，结果按仓库路径和完整哈希缓存）"""
+    repo = _RepoCache.get(repo_path)
+    # 提交对象经 GitPython 常驻的 cat-file 进程读取，不会为每次查询启动新进程；
+    # 提交属性按需读取，在锁内一次取完
+    with _RepoCache.odb_lock(repo):
+        commit = repo.commit(commit_hash)
+        commit_row = CommitRow(commit.hexsha[:7], commit.summary, commit.author.name,
+                               commit.committed_datetime.strftime("%Y-%m-%d %H:%M"), commit.hexsha)
+        # 与第一个父提交比较（合并提交单独给出时 diff-tree 没有输出），初始提交与空树比较
+        trees = (commit.parents[0].hexsha, commit.hexsha) if commit.parents else ('--root', commit.hexsha)
+
+    # 一次 diff-tree 同时取回变更列表（--raw）和差异内容（-p）
+    output = repo.git.diff_tree('--no-commit-id', '-r', '-M', '--raw', '-p', *trees,
+                                env=_COMMIT_VIEW_GIT_ENV)
+    first_diff = _DIFF_FILE_RE.search(output)
+    raw_part = output[:first_diff.start()] if first_diff else output
+    per_file = _split_diff_by_file(output[first_diff.start():]) if first_diff else {}
+
+    files_changed = []
+    for line in raw_part.splitlines():
+        if not line.startswith(':'):
+            continue
+        # 格式: ":旧模式 新模式 旧对象 新对象 状态\t路径[\t新路径]"
+        meta, *paths = line[1:].split('\t')
+        change_type = meta.split()[-1][0]
+        path = paths[-1]
+        try:
+            diff_content = per_file.get(path)
+            if diff_content is None:
+                # 路径无法从整体差异中识别时（如含特殊字符被转义），单独获取
+                diff_content = repo.git.diff_tree('--no-commit-id', '-r', '-M', '-p', *trees,
+                                                  '--', *paths, env=_COMMIT_VIEW_GIT_ENV)
+        except Exception as e:
+            # 如果获取差异失败，至少显示文件路径和变更类型
+            diff_content = f"无法获取差异信息: {str(e)}"
+        files_changed.append({
+            'path': path,
+            'change_type': change_type,
+            'diff': diff_content
+        })
+
+    result = {
+        'commit': commit_row,
+        'files_changed': files_changed
+    }
+    return result
 
 
 class GitProgressHandler(RemoteProgress):
     """Git操作进度处理类"""
 
-    def __init__(self, signals):
+    def __init__(self, bus, req_id):
         super().__init__()
-        self.signals = signals
-        self.last_update = 0
+        self.bus = bus
+        self.req_id = req_id
+        self.last_update = 0.0
+        self.last_pct = None
 
     def update(self, op_code, cur_count, max_count=None, message=''):
-        # 限制进度更新频率，避免过于频繁的UI更新
-        current_time = time.time()
-        if current_time - self.last_update > 0.5 or message:
-            # 发送进度信息
-            if message:
-                self.signals.progress.emit(message)
-            elif max_count and max_count > 0:
-                percentage = (cur_count / max_count) * 100
-                self.signals.progress.emit(f"进度: {percentage:.1f}%")
-            else:
-                self.signals.progress.emit("处理中...")
-            self.last_update = current_time
+        # 限制进度更新频率：百分比变化且距上次发送超过间隔时才更新UI，阶段开始与结束时总是发送
+        current_time = time.monotonic()
+        pct = int(cur_count * 100 / max_count) if max_count else -1
+        if not op_code & (self.BEGIN | self.END):
+            if pct == self.last_pct or current_time - self.last_update < _PROGRESS_INTERVAL:
+                return
+
+        # 发送进度信息：阶段名称、百分比及 git 附带的传输速度等信息
+        phase = _PROGRESS_PHASES.get(op_code & self.OP_MASK, "处理中")
+        text = _PROGRESS_FORMAT % (phase, pct) if pct >= 0 else f"{phase}..."
+        if message:
+            text = f"{text} ({message})"
+        self.bus.progress.emit(self.req_id, text)
+        self.last_pct = pct
+        self.last_update = current_time
 
 
 class GitWorkerSignals(QObject):
@@ -49,59 +567,98 @@ class GitWorkerSignals(QObject):
     progress = pyqtSignal(str)
 
 
+class GitSignalBus(QObject):
+    """共享信号总线：各Git工作线程通过请求编号区分结果，无需各自创建信号对象"""
+    result = pyqtSignal(int, object)
+    error = pyqtSignal(int, str)
+    progress = pyqtSignal(int, str)
+    chunk = pyqtSignal(int, str)
+
+
+@dataclass(slots=True)
+class CommitPushResult:
+    """提交并推送的结果：提交已完成，push_error 为推送失败的原因，推送成功时为 None"""
+    message: str
+    push_error: str | None
+
+
 class GitWorker(QRunnable):
     """Git操作工作线程"""
 
-    def __init__(self, repo_path, operation, *args):
+    def __init__(self, bus, req_id, repo_path, operation, *args):
         super().__init__()
+        self.bus = bus
+        self.req_id = req_id
         self.repo_path = repo_path
         self.operation = operation
         self.args = args
-        self.signals = GitWorkerSignals()
 
     def run(self):
-        start_time = time.time()
+        # 仅在开启调试日志时才计时
+        timed = log.isEnabledFor(logging.DEBUG)
+        start_time = time.perf_counter() if timed else 0.0
         try:
-            # 记录Git仓库初始化时间
-            repo_init_start = time.time()
-            repo = Repo(self.repo_path)
-            repo_init_time = time.time() - repo_init_start
-            print(f"Git repository initialization took {repo_init_time:.2f} seconds")
+            if self.operation == "open":
+                self.open_repo()
+                return
 
-            operation_start = time.time()
+            repo = _RepoCache.get(self.repo_path)
+            if timed:
+                operation_start = time.perf_counter()
+                log.debug('op=%s repo_open=%.2fs', self.operation, operation_start - start_time)
 
             if self.operation == "status":
+                # index 与 HEAD 未变化时直接返回上次的解析结果；强制刷新时总是重新执行 git status
+                force = self.args[0] if self.args else False
+                generation = _StatusCache.generation(self.repo_path)
+                stamp = _StatusCache.stamp(repo.git_dir)
+                cached = None if force else _StatusCache.get(self.repo_path, stamp)
+                if cached is not None:
+                    self.bus.result.emit(self.req_id, cached)
+                    return
+
                 status_result = []
-                git_status = repo.git.status('--porcelain')
-                for line in git_status.split('\n'):
-                    if line.strip():
-                        if line.startswith("??"):
-                            status_result.append(("未跟踪", line[3:], "➕"))
-                        else:
-                            code = line[0]
-                            file_path = line[3:]
-                            if code == "A":
-                                status_result.append(("已暂存", file_path, "✅"))
-                            elif code == "M":
-                                status_result.append(("修改", file_path, "📝"))
-                            elif code == "D":
-                                status_result.append(("删除", file_path, "❌"))
-                            else:
-                                status_result.append(("未暂存", file_path, "📝"))
-                self.signals.result.emit(status_result)
+                # porcelain v2 + -z：字段固定、以 NUL 分隔，文件名无需转义
+                git_status = repo.git.status('--porcelain=v2', '-z', '--untracked-files=all',
+                                             '--ignore-submodules=none', env=_READ_ONLY_GIT_ENV)
+                records = git_status.split('\x00')
+                total = len(records)
+                report = total > _STATUS_PROGRESS_THRESHOLD
+                skip_next = False
+                for index, record in enumerate(records, 1):
+                    if skip_next:
+                        # 重命名/复制记录后紧跟原路径
+                        skip_next = False
+                        continue
+                    if not record:
+                        continue
+                    kind = record[0]
+                    if kind == '?':
+                        status_result.append(("未跟踪", record[2:], "➕"))
+                    elif kind in _PORCELAIN_V2_FIELDS:
+                        fields = record.split(' ', _PORCELAIN_V2_FIELDS[kind])
+                        # XY 中的 X 为暂存区状态，未变化时为 '.'
+                        tag, icon = _STATUS_MAP.get(fields[1][0], _STATUS_DEFAULT)
+                        status_result.append((tag, fields[-1], icon))
+                        skip_next = kind == '2'
+                    # 文件数量很多时分批报告解析进度
+                    if report and index % _STATUS_PROGRESS_BATCH == 0:
+                        self.bus.progress.emit(self.req_id, f"正在解析文件状态: {index}/{total}")
+                _StatusCache.put(self.repo_path, stamp, status_result, generation)
+                self.bus.result.emit(self.req_id, status_result)
 
             elif self.operation == "log":
-                commits = list(repo.iter_commits(max_count=20))
+                # 一次 git log 直接输出所需字段，避免逐个解析提交对象；按页读取
+                skip = self.args[0] if self.args else 0
+                limit = self.args[1] if len(self.args) > 1 else _LOG_PAGE_SIZE
+                raw = repo.git.log(f'--skip={skip}', f'--max-count={limit}',
+                                   f'--pretty=format:{_LOG_FORMAT}', env=_READ_ONLY_GIT_ENV)
                 log_result = []
-                for commit in commits:
-                    log_result.append({
-                        'hash': commit.hexsha[:7],
-                        'message': commit.summary,
-                        'author': commit.author.name,
-                        'date': commit.committed_datetime.strftime("%Y-%m-%d %H:%M"),
-                        'full_hash': commit.hexsha
-                    })
-                self.signals.result.emit(log_result)
+                for line in raw.splitlines():
+                    full_hash, author, date, message = line.split('\x1f', 3)
+                    log_result.append(CommitRow(full_hash[:7], message, author,
+                                                date[:16].replace('T', ' '), full_hash))
+                self.bus.result.emit(self.req_id, log_result)
 
             elif self.operation == "branches":
                 branch_info = {
@@ -110,73 +667,51 @@ class GitWorker(QRunnable):
                     'active_branch': None
                 }
 
-                # 获取本地分支
-                branch_info['local_branches'] = [branch.name for branch in repo.branches]
-                # 获取当前活跃分支
-                branch_info['active_branch'] = repo.active_branch.name
-
-                # 获取远程分支
-                try:
-                    # 获取所有远程分支
-                    for remote in repo.remotes:
-                        for ref in remote.refs:
-                            # 只添加远程分支，不包括 HEAD 引用
-                            if not ref.name.endswith('/HEAD'):
-                                # 提取分支名，去掉 "origin/" 前缀
-                                remote_name = ref.name
-                                if '/' in remote_name and not remote_name.startswith('origin/HEAD'):
-                                    branch_info['remote_branches'].append(remote_name)
-                except Exception as e:
-                    print(f"获取远程分支时出错: {e}")
-                    pass
-
-                self.signals.result.emit(branch_info)
+                # 一次 for-each-ref 读取所有本地和远程分支，并标记当前分支
+                raw = repo.git.for_each_ref('--format=%(refname)%09%(HEAD)', 'refs/heads/', 'refs/remotes/',
+                                            env=_READ_ONLY_GIT_ENV)
+                for line in raw.splitlines():
+                    refname, head = line.split('\t')
+                    if refname.startswith('refs/heads/'):
+                        name = refname[len('refs/heads/'):]
+                        branch_info['local_branches'].append(name)
+                        if head == '*':
+                            branch_info['active_branch'] = name
+                    elif not refname.endswith('/HEAD'):
+                        # 远程分支保留远程名前缀，如 origin/main，不包括 HEAD 引用
+                        branch_info['remote_branches'].append(refname[len('refs/remotes/'):])
+
+                self.bus.result.emit(self.req_id, branch_info)
 
             elif self.operation == "add":
                 repo.git.add('.')
-                self.signals.result.emit("所有文件已暂存")
+                _StatusCache.invalidate(self.repo_path)
+                self.bus.result.emit(self.req_id, "所有文件已暂存")
 
             elif self.operation == "commit":
                 message = self.args[0] if self.args else "Update"
                 repo.git.commit('-m', message)
-                self.signals.result.emit(f"提交成功: {message}")
+                _StatusCache.invalidate(self.repo_path)
+                self.bus.result.emit(self.req_id, _COMMIT_DONE_FORMAT % message)
 
             elif self.operation == "push":
-                # 设置Git配置优化
-                repo.git.config('http.lowSpeedLimit', '1000')
-                repo.git.config('http.lowSpeedTime', '30')
-
-                origin = repo.remote(name='origin')
-                progress_handler = GitProgressHandler(self.signals)
+                self.push(repo)
 
-                try:
-                    push_start = time.time()
-                    origin.push(progress=progress_handler)
-                    push_time = time.time() - push_start
-                    print(f"Push operation took {push_time:.2f} seconds")
-                    self.signals.result.emit("推送成功")
-                except GitCommandError as e:
-                    # 检查是否是因为没有设置上游分支
-                    if "has no upstream branch" in str(e):
-                        # 获取当前分支名
-                        current_branch = repo.active_branch.name
-                        # 提示用户设置上游分支
-                        error_msg = (f"分支 '{current_branch}' 没有设置上游分支。\n"
-                                     f"请使用 'git push --set-upstream origin {current_branch}' "
-                                     f"命令设置上游分支，或者在界面中选择相应选项。")
-                        self.signals.error.emit(error_msg)
-                    else:
-                        # 其他推送错误
-                        self.signals.error.emit(str(e))
+            elif self.operation == "add_commit_push":
+                # 暂存、提交、推送在同一个任务中依次完成
+                message = self.args[0]
+                repo.git.add('.')
+                _StatusCache.invalidate(self.repo_path)
+                self.bus.progress.emit(self.req_id, "所有文件已暂存")
+                repo.git.commit('-m', message)
+                # 提交完成后推送失败不算任务失败，推送结果随提交结果一起返回
+                self.bus.result.emit(self.req_id, CommitPushResult(_COMMIT_DONE_FORMAT % message,
+                                                                   self.push_to_origin(repo)))
 
             elif self.operation == "push_with_upstream":
-                # 设置Git配置优化
-                repo.git.config('http.lowSpeedLimit', '1000')
-                repo.git.config('http.lowSpeedTime', '30')
-
                 # 推送并设置上游分支
                 origin = repo.remote(name='origin')
-                progress_handler = GitProgressHandler(self.signals)
+                progress_handler = GitProgressHandler(self.bus, self.req_id)
                 current_branch = repo.active_branch.name
 
                 try:
@@ -184,15 +719,12 @@ class GitWorker(QRunnable):
                     origin.push(refspec=f"{current_branch}:{current_branch}",
                                 set_upstream=True,  # 修正参数名
                                 progress=progress_handler)
-                    self.signals.result.emit(f"推送成功，并已设置上游分支为 origin/{current_branch}")
+                    _RepoCache.invalidate(self.repo_path)
+                    self.bus.result.emit(self.req_id, f"推送成功，并已设置上游分支为 origin/{current_branch}")
                 except GitCommandError as e:
-                    self.signals.error.emit(str(e))
+                    self.bus.error.emit(self.req_id, str(e))
 
             elif self.operation == "pull":
-                # 设置Git配置优化
-                repo.git.config('http.lowSpeedLimit', '1000')
-                repo.git.config('http.lowSpeedTime', '30')
-
                 origin = repo.remote(name='origin')
 
                 # 获取拉取选项参数
@@ -205,14 +737,13 @@ class GitWorker(QRunnable):
                     pull_kwargs['prune'] = prune
 
                 # 添加进度处理
-                progress_handler = GitProgressHandler(self.signals)
+                progress_handler = GitProgressHandler(self.bus, self.req_id)
                 pull_kwargs['progress'] = progress_handler
 
-                pull_start = time.time()
                 origin.pull(**pull_kwargs)
-                pull_time = time.time() - pull_start
-                print(f"Pull operation took {pull_time:.2f} seconds")
-                self.signals.result.emit("拉取成功")
+                _RepoCache.invalidate(self.repo_path)
+                _StatusCache.invalidate(self.repo_path)
+                self.bus.result.emit(self.req_id, "拉取成功")
 
             elif self.operation == "checkout":
                 if len(self.args) == 3 and self.args[0] == "-b":
@@ -220,105 +751,177 @@ class GitWorker(QRunnable):
                     branch_name = self.args[1]
                     remote_branch = self.args[2]
                     repo.git.checkout('-b', branch_name, remote_branch)
-                    self.signals.result.emit(f"创建并切换到新分支: {branch_name} (跟踪 {remote_branch})")
+                    _RepoCache.invalidate(self.repo_path)
+                    _StatusCache.invalidate(self.repo_path)
+                    self.bus.result.emit(self.req_id, f"创建并切换到新分支: {branch_name} (跟踪 {remote_branch})")
                 else:
                     branch_name = self.args[0]
                     repo.git.checkout(branch_name)
-                    self.signals.result.emit(f"切换到分支: {branch_name}")
+                    _RepoCache.invalidate(self.repo_path)
+                    _StatusCache.invalidate(self.repo_path)
+                    self.bus.result.emit(self.req_id, f"切换到分支: {branch_name}")
 
             elif self.operation == "create_branch":
                 branch_name = self.args[0]
                 repo.git.checkout('-b', branch_name)
-                self.signals.result.emit(f"创建并切换到新分支: {branch_name}")
+                _RepoCache.invalidate(self.repo_path)
+                self.bus.result.emit(self.req_id, f"创建并切换到新分支: {branch_name}")
 
             elif self.operation == "merge":
                 branch_name = self.args[0]
                 repo.git.merge(branch_name)
-                self.signals.result.emit(f"成功合并分支: {branch_name}")
+                _RepoCache.invalidate(self.repo_path)
+                _StatusCache.invalidate(self.repo_path)
+                self.bus.result.emit(self.req_id, f"成功合并分支: {branch_name}")
 
             elif self.operation == "cherry_pick":
                 commit_hash = self.args[0]
                 repo.git.cherry_pick(commit_hash)
-                self.signals.result.emit(f"成功cherry-pick提交: {commit_hash[:7]}")
+                _StatusCache.invalidate(self.repo_path)
+                self.bus.result.emit(self.req_id, f"成功cherry-pick提交: {commit_hash[:7]}")
 
             elif self.operation == "show_commit":
                 commit_hash = self.args[0]
-                commit = repo.commit(commit_hash)
-
-                # 获取提交的文件变更
-                diff = commit.diff(commit.parents[0]) if commit.parents else commit.diff()  # 初始提交
-
-                files_changed = []
-                for diff_item in diff:
-                    try:
-                        # 获取文件差异
-                        if commit.parents:
-                            diff_content = repo.git.diff(commit.parents[0].hexsha, commit.hexsha,
-                                                         '--', diff_item.b_path or diff_item.a_path)
-                        else:
-                            # 对于初始提交，显示文件完整内容
-                            diff_content = repo.git.show(f"{commit.hexsha}:{diff_item.b_path or diff_item.a_path}")
-
-                        file_info = {
-                            'path': diff_item.b_path or diff_item.a_path,
-                            'change_type': diff_item.change_type,
-                            'diff': diff_content
-                        }
-                        files_changed.append(file_info)
-                    except Exception as e:
-                        # 如果获取差异失败，至少显示文件路径和变更类型
-                        file_info = {
-                            'path': diff_item.b_path or diff_item.a_path,
-                            'change_type': diff_item.change_type,
-                            'diff': f"无法获取差异信息: {str(e)}"
-                        }
-                        files_changed.append(file_info)
-
-                result = {
-                    'commit': {
-                        'hash': commit.hexsha[:7],
-                        'full_hash': commit.hexsha,
-                        'message': commit.summary,
-                        'author': commit.author.name,
-                        'date': commit.committed_datetime.strftime("%Y-%m-%d %H:%M")
-                    },
-                    'files_changed': files_changed
-                }
-                self.signals.result.emit(result)
+                result = _build_commit_view(self.repo_path, commit_hash)
+                self.bus.result.emit(self.req_id, result)
 
             elif self.operation == "diff":
                 file_path = self.args[0]
-                diff_content = repo.git.diff('HEAD', '--', file_path)
-                self.signals.result.emit(diff_content)
+                untracked = len(self.args) > 1 and self.args[1]
+                if untracked:
+                    diff_content = _untracked_file_diff(repo.working_dir, file_path)
+                else:
+                    # 小文本文件在进程内比较，免去每次启动 git diff
+                    diff_content = _tracked_file_diff(repo, file_path)
+                if diff_content is None:
+                    total = self.stream_diff(repo, file_path, untracked)
+                else:
+                    total = self.emit_diff_chunk(diff_content) if diff_content else 0
+                self.bus.result.emit(self.req_id, total)
 
             elif self.operation == "checkout_file":
                 file_path = self.args[0]
                 repo.git.checkout('--', file_path)
-                self.signals.result.emit(f"已取消变更: {file_path}")
+                _StatusCache.invalidate(self.repo_path)
+                self.bus.result.emit(self.req_id, f"已取消变更: {file_path}")
 
             elif self.operation == "add_remote":
                 remote_name = self.args[0]
                 remote_url = self.args[1]
                 repo.create_remote(remote_name, remote_url)
-                self.signals.result.emit(f"远程仓库 '{remote_name}' 已添加，URL: {remote_url}")
+                _RepoCache.invalidate(self.repo_path)
+                self.bus.result.emit(self.req_id, f"远程仓库 '{remote_name}' 已添加，URL: {remote_url}")
 
             elif self.operation == "delete_branch":
                 branch_name = self.args[0]
                 force = self.args[1] if len(self.args) > 1 else False
                 if force:
                     repo.git.branch('-D', branch_name)
-                    self.signals.result.emit(f"分支 '{branch_name}' 已强制删除")
+                    _RepoCache.invalidate(self.repo_path)
+                    self.bus.result.emit(self.req_id, f"分支 '{branch_name}' 已强制删除")
                 else:
                     repo.git.branch('-d', branch_name)
-                    self.signals.result.emit(f"分支 '{branch_name}' 已删除")
+                    _RepoCache.invalidate(self.repo_path)
+                    self.bus.result.emit(self.req_id, f"分支 '{branch_name}' 已删除")
 
-            operation_time = time.time() - operation_start
-            total_time = time.time() - start_time
-            print(f"Git operation '{self.operation}' took {operation_time:.2f} seconds")
-            print(f"Total worker execution time: {total_time:.2f} seconds")
+            if timed:
+                end_time = time.perf_counter()
+                log.debug('op=%s took=%.2fs total=%.2fs', self.operation,
+                          end_time - operation_start, end_time - start_time)
 
         except Exception as e:
-            self.signals.error.emit(str(e))
+            self.bus.error.emit(self.req_id, str(e))
+
+    def open_repo(self):
+        """打开仓库并返回其工作目录，目录不是有效的Git仓库时返回 None"""
+        try:
+            repo = _RepoCache.get(self.repo_path)
+        except InvalidGitRepositoryError:
+            self.bus.result.emit(self.req_id, None)
+            return
+        if repo.working_dir != self.repo_path:
+            _RepoCache.put(repo.working_dir, repo)
+        self.bus.result.emit(self.req_id, repo.working_dir)
+
+    def push(self, repo):
+        """推送到 origin 并发送结果"""
+        error_msg = self.push_to_origin(repo)
+        if error_msg is None:
+            self.bus.result.emit(self.req_id, "推送成功")
+        else:
+            self.bus.error.emit(self.req_id, error_msg)
+
+    def push_to_origin(self, repo):
+        """推送到 origin，返回失败原因，成功时返回 None；没有上游分支时给出提示"""
+        origin = repo.remote(name='origin')
+        progress_handler = GitProgressHandler(self.bus, self.req_id)
+
+        try:
+            origin.push(progress=progress_handler)
+            _RepoCache.invalidate(self.repo_path)
+            return None
+        except GitCommandError as e:
+            # 检查是否是因为没有设置上游分支
+            if "has no upstream branch" in str(e):
+                # 获取当前分支名
+                current_branch = repo.active_branch.name
+                # 提示用户设置上游分支
+                return (f"分支 '{current_branch}' 没有设置上游分支。\n"
+                        f"请使用 'git push --set-upstream origin {current_branch}' "
+                        f"命令设置上游分支，或者在界面中选择相应选项。")
+            # 其他推送错误
+            return str(e)
+
+    def stream_diff(self, repo, file_path, untracked=False):
+        """逐块读取 git diff 输出并发送到界面，返回发送的字符总数；
+        未跟踪文件与空文件比较（--no-index），有差异时退出码为 1"""
+        # 关闭颜色与外部差异工具，固定上下文行数，输出不受用户配置影响
+        target = ('--no-index', '--', '/dev/null', file_path) if untracked else ('HEAD', '--', file_path)
+        proc = repo.git.diff('--no-color', '--no-ext-diff', '-U3', *target,
+                             as_process=True, env=_READ_ONLY_GIT_ENV)
+        total = 0
+        batch = []
+        batch_size = 0
+        # 按整行累积再解码，避免多字节字符被截断在两块之间
+        for line in proc.stdout:
+            batch.append(line)
+            batch_size += len(line)
+            if batch_size >= _DIFF_CHUNK_SIZE:
+                total += self.emit_diff_chunk(b''.join(batch).decode('utf-8', 'replace'))
+                batch = []
+                batch_size = 0
+        if batch:
+            total += self.emit_diff_chunk(b''.join(batch).decode('utf-8', 'replace'))
+        # 退出码非零时抛出 GitCommandError
+        try:
+            proc.wait()
+        except GitCommandError as e:
+            if not (untracked and e.status == 1):
+                raise
+        return total
+
+    def emit_diff_chunk(self, text):
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+        self.bus.chunk.emit(self.req_id, text)
+        return len(text)
+
+
+class ConfigSaveWorker(QRunnable):
+    """后台保存仓库配置"""
+
+    def __init__(self, bus, req_id, repo_paths, generation):
+        super().__init__()
+        self.bus = bus
+        self.req_id = req_id
+        self.repo_paths = list(repo_paths)
+        self.generation = generation
+
+    def run(self):
+        try:
+            _ConfigWriter.write(self.repo_paths, self.generation)
+            self.bus.result.emit(self.req_id, None)
+        except Exception as e:
+            self.bus.error.emit(self.req_id, str(e))
 
 
 class CloneDialog(QDialog):
@@ -354,6 +957,12 @@ class CloneDialog(QDialog):
         path_layout.addWidget(self.browse_btn)
         layout.addLayout(path_layout)
 
+        # 克隆方式
+        self.full_clone_check = QCheckBox("完整克隆（立即下载所有历史文件内容）")
+        layout.addWidget(self.full_clone_check)
+        self.shallow_check = QCheckBox("浅克隆（仅默认分支的最新提交）")
+        layout.addWidget(self.shallow_check)
+
         # 按钮
         button_layout = QHBoxLayout()
         button_layout.addStretch()
@@ -391,6 +1000,10 @@ class CloneDialog(QDialog):
             QMessageBox.warning(self, "警告", "本地路径不存在")
             return
 
+        self.clone_options = {} if self.full_clone_check.isChecked() else dict(_CLONE_OPTIONS)
+        if self.shallow_check.isChecked():
+            self.clone_options.update(_SHALLOW_CLONE_OPTIONS)
+
         # 获取仓库名称
         repo_name = self.repo_url.split('/')[-1].replace('.git', '')
         self.clone_target_path = os.path.join(self.local_path, repo_name)
@@ -408,10 +1021,61 @@ class CloneDialog(QDialog):
         super().accept()
 
 
+@lru_cache(maxsize=None)
+def _diff_font():
+    """差异视图共用的等宽字体（需在 QApplication 创建后调用）"""
+    font = QFont("Courier New", 10)
+    font.setStyleHint(QFont.Monospace)
+    return font
+
+
+def _format_diff_text(diff_content):
+    """整理差异文本：统一换行符，空内容给出占位提示"""
+    if not diff_content:
+        return "无差异信息"
+    return diff_content.replace('\r\n', '\n').replace('\r', '\n')
+
+
+class DiffFormatWorker(QRunnable):
+    """差异文本整理线程，避免大段字符串处理阻塞界面"""
+
+    def __init__(self, diff_content):
+        super().__init__()
+        self.diff_content = diff_content
+        self.signals = GitWorkerSignals()
+
+    def run(self):
+        try:
+            self.signals.result.emit(_format_diff_text(self.diff_content))
+        except Exception as e:
+            self.signals.error.emit(str(e))
+
+
+class DiffHighlighter(QSyntaxHighlighter):
+    """差异内容高亮：新增行、删除行（不含 +++/--- 文件头）与 @@ 区块头"""
+
+    def __init__(self, document):
+        super().__init__(document)
+        self.formats = {}
+        for prefix, (color, background) in _DIFF_LINE_COLORS.items():
+            text_format = QTextCharFormat()
+            text_format.setForeground(QColor(color))
+            text_format.setBackground(QColor(background))
+            self.formats[prefix] = text_format
+
+    def highlightBlock(self, text):
+        if not text or text.startswith(('+++', '---')):
+            return
+        text_format = self.formats.get(text[0])
+        if text_format is not None:
+            self.setFormat(0, len(text), text_format)
+
+
 class DiffDialog(QDialog):
     """差异显示对话框"""
 
-    def __init__(self, file_path, diff_content, parent=None):
+    def __init__(self, file_path, diff_content=None, parent=None):
+        """diff_content 为 None 时等待 append_text 逐块追加，结束后调用 finish_stream"""
         super().__init__(parent)
         self.file_path = file_path
         self.diff_content = diff_content
@@ -420,6 +1084,8 @@ class DiffDialog(QDialog):
         self.resize(800, 600)
 
     def init_ui(self):
+        from PyQt5.QtWidgets import QProgressBar
+
         layout = QVBoxLayout()
 
         # 文件路径标签
@@ -428,15 +1094,27 @@ class DiffDialog(QDialog):
         layout.addWidget(path_label)
 
         # 差异内容显示
-        self.diff_text = QTextBrowser()
-        self.diff_text.setFont(QFont("Courier New", 10))
-
-        # 简单的语法高亮
-        formatted_diff = self.format_diff_content(self.diff_content)
-        self.diff_text.setHtml(formatted_diff)
-
+        self.diff_text = QPlainTextEdit()
+        self.diff_text.setReadOnly(True)
+        self.diff_text.setFont(_diff_font())
+        self.diff_text.setLineWrapMode(QPlainTextEdit.NoWrap)
+
+        # 简单的语法高亮，只在文本排版时对可见块着色
+        self.highlighter = DiffHighlighter(self.diff_text.document())
+
+        # 文本在后台整理完成前显示忙碌进度条
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.setTextVisible(False)
+        layout.addWidget(self.progress_bar)
         layout.addWidget(self.diff_text)
 
+        if self.diff_content is not None:
+            self.format_worker = DiffFormatWorker(self.diff_content)
+            self.format_worker.signals.result.connect(self.on_diff_formatted)
+            self.format_worker.signals.error.connect(self.on_diff_formatted)
+            QThreadPool.globalInstance().start(self.format_worker)
+
         # 按钮
         button_layout = QHBoxLayout()
         button_layout.addStretch()
@@ -447,22 +1125,22 @@ class DiffDialog(QDialog):
 
         self.setLayout(layout)
 
-    def format_diff_content(self, content):
-        """简单格式化差异内容"""
-        lines = content.split('\n')
-        formatted_lines = []
+    def on_diff_formatted(self, text):
+        """显示整理好的差异文本"""
+        self.diff_text.setPlainText(text)
+        self.progress_bar.hide()
 
-        for line in lines:
-            if line.startswith('+') and not line.startswith('+++'):
-                formatted_lines.append(f'<span style="color: green; background-color: #f0fff0;">{line}</span>')
-            elif line.startswith('-') and not line.startswith('---'):
-                formatted_lines.append(f'<span style="color: red; background-color: #fff0f0;">{line}</span>')
-            elif line.startswith('@'):
-                formatted_lines.append(f'<span style="color: blue; background-color: #f0f0ff;">{line}</span>')
-            else:
-                formatted_lines.append(line)
+    def append_text(self, chunk):
+        """在末尾追加一块差异文本"""
+        self.diff_text.moveCursor(QTextCursor.End)
+        self.diff_text.insertPlainText(chunk)
 
-        return '<br>'.join(formatted_lines)
+    def finish_stream(self):
+        """差异接收完毕"""
+        if self.diff_text.document().isEmpty():
+            self.diff_text.setPlainText(_format_diff_text(""))
+        self.diff_text.moveCursor(QTextCursor.Start)
+        self.progress_bar.hide()
 
 
 class CommitDetailDialog(QDialog):
@@ -477,12 +1155,15 @@ class CommitDetailDialog(QDialog):
         self.resize(800, 600)
 
     def init_ui(self):
+        # 对话框专用控件在首次打开时才导入
+        from PyQt5.QtWidgets import QFormLayout, QTabWidget
+
         layout = QVBoxLayout()
 
         # 标题区域
         title_group = QGroupBox("提交信息")
         title_layout = QVBoxLayout()
-        title_label = QLabel(f"<h3>{self.commit_data['commit']['message']}</h3>")
+        title_label = QLabel(f"<h3>{self.commit_data['commit'].message}</h3>")
         title_label.setWordWrap(True)
         title_layout.addWidget(title_label)
         title_group.setLayout(title_layout)
@@ -492,14 +1173,14 @@ class CommitDetailDialog(QDialog):
         detail_group = QGroupBox("详细信息")
         detail_layout = QFormLayout()
 
-        hash_label = QLabel(self.commit_data['commit']['full_hash'])
+        hash_label = QLabel(self.commit_data['commit'].full_hash)
         hash_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
         detail_layout.addRow(QLabel("提交哈希:"), hash_label)
 
-        author_label = QLabel(self.commit_data['commit']['author'])
+        author_label = QLabel(self.commit_data['commit'].author)
         detail_layout.addRow(QLabel("作者:"), author_label)
 
-        date_label = QLabel(self.commit_data['commit']['date'])
+        date_label = QLabel(self.commit_data['commit'].date)
         detail_layout.addRow(QLabel("日期:"), date_label)
 
         detail_group.setLayout(detail_layout)
@@ -510,11 +1191,16 @@ class CommitDetailDialog(QDialog):
         files_layout = QVBoxLayout()
 
         self.files_tabs = QTabWidget()
+        # 标签页内容在首次切换到该页时才创建
+        self._pending_tabs = {}
+        self._format_workers = []
+        self.files_tabs.currentChanged.connect(self._materialize_tab)
         files_layout.addWidget(self.files_tabs)
 
         # 添加文件变更标签页
         for file_info in self.commit_data['files_changed']:
             self.add_file_tab(file_info)
+        self._materialize_tab(self.files_tabs.currentIndex())
 
         files_group.setLayout(files_layout)
         layout.addWidget(files_group)
@@ -530,8 +1216,20 @@ class CommitDetailDialog(QDialog):
         self.setLayout(layout)
 
     def add_file_tab(self, file_info):
-        """添加文件变更标签页"""
-        tab = QWidget()
+        """添加文件变更标签页（仅占位，内容延迟创建）"""
+        tab_title = os.path.basename(file_info['path']) if file_info['path'] else "未知文件"
+        index = self.files_tabs.addTab(QWidget(), tab_title)
+        self._pending_tabs[index] = file_info
+
+    def _materialize_tab(self, index):
+        """创建标签页的实际内容"""
+        file_info = self._pending_tabs.pop(index, None)
+        if file_info is None:
+            return
+
+        from PyQt5.QtWidgets import QProgressBar
+
+        tab = self.files_tabs.widget(index)
         tab_layout = QVBoxLayout()
 
         # 文件路径和变更类型
@@ -543,37 +1241,222 @@ class CommitDetailDialog(QDialog):
         header_layout.addStretch()
         tab_layout.addLayout(header_layout)
 
-        # 差异内容
-        diff_text = QTextBrowser()
-        diff_text.setFont(QFont("Courier New", 10))
-        diff_text.setPlainText(file_info['diff'] if file_info['diff'] else "无差异信息")
+        # 差异内容，文本在后台整理完成后再填充
+        diff_text = QPlainTextEdit()
+        diff_text.setReadOnly(True)
+        diff_text.setFont(_diff_font())
+        diff_text.setLineWrapMode(QPlainTextEdit.NoWrap)
+        progress_bar = QProgressBar()
+        progress_bar.setRange(0, 0)
+        progress_bar.setTextVisible(False)
+        tab_layout.addWidget(progress_bar)
         tab_layout.addWidget(diff_text)
 
         tab.setLayout(tab_layout)
 
-        # 添加标签页
-        tab_title = os.path.basename(file_info['path']) if file_info['path'] else "未知文件"
-        self.files_tabs.addTab(tab, tab_title)
+        worker = DiffFormatWorker(file_info['diff'])
+        worker.signals.result.connect(partial(self._show_tab_diff, diff_text, progress_bar))
+        worker.signals.error.connect(partial(self._show_tab_diff, diff_text, progress_bar))
+        self._format_workers.append(worker)
+        QThreadPool.globalInstance().start(worker)
+
+    @staticmethod
+    def _show_tab_diff(view, progress_bar, text):
+        """填充标签页的差异文本"""
+        view.setPlainText(text)
+        progress_bar.hide()
+
+
+@dataclass(slots=True)
+class CloneResult:
+    """克隆成功的结果"""
+    local_path: str
+    message: str
 
 
 class CloneWorker(QRunnable):
     """克隆仓库工作线程"""
 
-    def __init__(self, repo_url, local_path, clone_target_path):
+    def __init__(self, bus, req_id, repo_url, local_path, clone_target_path, options=None):
         super().__init__()
+        self.bus = bus
+        self.req_id = req_id
         self.repo_url = repo_url
         self.local_path = local_path
         self.clone_target_path = clone_target_path
-        self.signals = GitWorkerSignals()
+        self.options = options or {}
 
     def run(self):
         try:
             # 使用GitPython克隆仓库
-            progress_handler = GitProgressHandler(self.signals)
-            repo = Repo.clone_from(self.repo_url, self.clone_target_path, progress=progress_handler)
-            self.signals.result.emit(f"仓库克隆成功: {self.clone_target_path}")
+            progress_handler = GitProgressHandler(self.bus, self.req_id)
+            repo = Repo.clone_from(self.repo_url, self.clone_target_path, progress=progress_handler,
+                                   **self.options)
+            _RepoCache.put(self.clone_target_path, repo)
+            self.bus.result.emit(self.req_id, CloneResult(self.clone_target_path,
+                                                          f"仓库克隆成功: {self.clone_target_path}"))
         except Exception as e:
-            self.signals.error.emit(str(e))
+            self.bus.error.emit(self.req_id, str(e))
+
+
+class StatusModel(QAbstractTableModel):
+    """文件状态表格模型，状态、文件和图标三列分别存放在独立的列表中"""
+
+    HEADERS = ("状态", "文件", "图标")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.statuses = []
+        self.paths = []
+        self.icons = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.paths)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        return (self.statuses, self.paths, self.icons)[index.column()][index.row()]
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def set_rows(self, rows):
+        """更新表格内容，rows 为 (状态, 文件, 图标) 元组列表；
+        只通知发生变化的行，刷新后滚动位置和选中状态得以保留"""
+        if rows:
+            statuses, paths, icons = (list(column) for column in zip(*rows))
+        else:
+            statuses, paths, icons = [], [], []
+        old_count, new_count = len(self.paths), len(paths)
+        common = min(old_count, new_count)
+
+        # 公共部分中第一个和最后一个内容变化的行
+        changed = [row for row in range(common)
+                   if self.paths[row] != paths[row] or self.statuses[row] != statuses[row]
+                   or self.icons[row] != icons[row]]
+
+        if new_count < old_count:
+            self.beginRemoveRows(QModelIndex(), new_count, old_count - 1)
+            del self.statuses[new_count:], self.paths[new_count:], self.icons[new_count:]
+            self.endRemoveRows()
+
+        if changed:
+            first, last = changed[0], changed[-1]
+            self.statuses[first:last + 1] = statuses[first:last + 1]
+            self.paths[first:last + 1] = paths[first:last + 1]
+            self.icons[first:last + 1] = icons[first:last + 1]
+            self.dataChanged.emit(self.index(first, 0), self.index(last, len(self.HEADERS) - 1))
+
+        if new_count > old_count:
+            self.beginInsertRows(QModelIndex(), old_count, new_count - 1)
+            self.statuses.extend(statuses[old_count:])
+            self.paths.extend(paths[old_count:])
+            self.icons.extend(icons[old_count:])
+            self.endInsertRows()
+
+    def row_data(self, row):
+        """返回指定行的 (状态, 文件, 图标)，行号无效时返回 None"""
+        if 0 <= row < len(self.paths):
+            return self.statuses[row], self.paths[row], self.icons[row]
+        return None
+
+
+def _combo_item(text, data):
+    """下拉框中的一项，data 保存在 UserRole 中"""
+    item = QStandardItem(text)
+    item.setData(data, Qt.UserRole)
+    return item
+
+
+def _combo_separator():
+    """下拉框分隔行（QComboBox 按 AccessibleDescriptionRole 识别）"""
+    item = QStandardItem()
+    item.setFlags(Qt.NoItemFlags)
+    item.setData("separator", Qt.AccessibleDescriptionRole)
+    return item
+
+
+def _combo_model(items, parent):
+    """一次性构建下拉框模型；以下拉框为父对象，替换模型时旧模型随之释放"""
+    model = QStandardItemModel(parent)
+    if items:
+        model.invisibleRootItem().appendRows(items)
+    return model
+
+
+class CommitListModel(QAbstractListModel):
+    """提交历史列表模型，直接保存 CommitRow 列表，不为每行创建控件；
+    滚动到末尾时通过 more_requested 请求下一页"""
+
+    LOADING_SUFFIX = " (加载中...)"
+    more_requested = pyqtSignal(int)  # 参数为已加载的提交数
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rows = []
+        self.loading_row = -1  # 正在加载详情的行
+        self.has_more = False
+        self.fetching = False
+        self.generation = 0  # 每次整体替换时递增，用于丢弃过期的分页结果
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        commit = self.rows[index.row()]
+        if role == Qt.DisplayRole:
+            text = f"{commit.hash} - {commit.message}"
+            if index.row() == self.loading_row:
+                text += self.LOADING_SUFFIX
+            return text
+        if role == Qt.UserRole:
+            return commit
+        return None
+
+    def set_rows(self, rows, has_more=False):
+        """整体替换提交列表"""
+        self.beginResetModel()
+        self.rows = list(rows)
+        self.loading_row = -1
+        self.has_more = has_more
+        self.fetching = False
+        self.generation += 1
+        self.endResetModel()
+
+    def append_rows(self, rows, generation, has_more):
+        """追加一页提交，列表已被替换时忽略"""
+        if generation != self.generation:
+            return
+        self.fetching = False
+        self.has_more = has_more
+        if rows:
+            self.beginInsertRows(QModelIndex(), len(self.rows), len(self.rows) + len(rows) - 1)
+            self.rows.extend(rows)
+            self.endInsertRows()
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.has_more and not self.fetching
+
+    def fetchMore(self, parent=QModelIndex()):
+        if self.canFetchMore(parent):
+            self.fetching = True
+            self.more_requested.emit(len(self.rows))
+
+    def set_loading_row(self, row):
+        """标记正在加载详情的行，row 为 -1 时清除标记"""
+        changed = [r for r in (self.loading_row, row) if 0 <= r < len(self.rows)]
+        self.loading_row = row
+        for r in changed:
+            index = self.index(r)
+            self.dataChanged.emit(index, index, [Qt.DisplayRole])
 
 
 class GitManager(QWidget):
@@ -582,10 +1465,45 @@ class GitManager(QWidget):
         self.repo_paths = []
         self.current_repo = None
         self.current_repo_path = None
-        self.threadpool = QThreadPool()
-        # 设置线程池最大线程数
-        self.threadpool.setMaxThreadCount(5)
-        self.active_operations = set()  # 跟踪正在进行的操作
+        # 本地Git操作使用全局线程池，按CPU核数设置最大线程数
+        self.threadpool = QThreadPool.globalInstance()
+        self.threadpool.setMaxThreadCount(max(4, QThread.idealThreadCount()))
+        # 推送、拉取、克隆等耗时的网络操作使用独立的小线程池，避免占满本地操作的线程
+        self.net_threadpool = QThreadPool()
+        self.net_threadpool.setMaxThreadCount(2)
+        self._active = Op(0)  # 正在进行的界面操作
+        self._inflight = {}  # 正在执行的 (仓库路径, 操作, 参数) -> 合并进来的 (结果回调, 错误回调) 列表
+        # 所有工作线程共用一个信号总线，按请求编号分发回调
+        self.bus = GitSignalBus(self)
+        self.bus.result.connect(self.on_bus_result)
+        self.bus.error.connect(self.on_bus_error)
+        self.bus.progress.connect(self.on_bus_progress)
+        self.bus.chunk.connect(self.on_bus_chunk)
+        self._req_ids = itertools.count(1)
+        self._callbacks = {}  # 请求编号 -> (结果回调, 错误回调, 进度回调, 分块回调)
+        self._query_cache = {}  # 仓库路径 -> {操作: (缓存键, 缓存时间, 结果)}
+        self._exists_cache = {}  # 仓库路径 -> (检查时间, 是否存在)
+        self._repo_meta = {}  # 仓库路径 -> (显示名称, 提示文字)
+        # 配置在后台写入，短时间内的多次保存合并为一次
+        self._config_generation = 0
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(_SAVE_DELAY_MS)
+        self._save_timer.timeout.connect(self.flush_config)
+        # 会显示加载状态的按钮及其原始文字
+        self._loading_widgets = []
+        self._orig_text = {}
+        self._branch_display = {}  # 分支名 -> 分支下拉框中的显示文本
+        self._status_stamp = None  # 状态表当前内容对应的 (仓库路径, index 与 HEAD 修改时间)
+        self._git_cache = {}  # (仓库路径, 操作, 键) -> (缓存时间, 结果)
+        # 短时间内的多次刷新请求合并为一次，按位记录需要刷新的区域
+        self._refresh_dirty = 0
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(_REFRESH_DELAY_MS)
+        self._refresh_timer.timeout.connect(self._do_refresh)
+        # 刷新进行中又收到的刷新请求，结果返回后重新执行
+        self._refresh_rerun = 0
         self.init_ui()
         self.load_config()
         self.setWindowTitle("多仓库Git管理系统")
@@ -599,13 +1517,13 @@ class GitManager(QWidget):
         # 顶部按钮区域
         # 顶部按钮区域 - 修改此处，将添加远程仓库按钮移到这里
         top_layout = QHBoxLayout()
-        self.add_repo_btn = QPushButton("添加仓库")
+        self.add_repo_btn = self._track(QPushButton("添加仓库"))
         self.add_repo_btn.clicked.connect(self.add_repo)
-        self.remove_repo_btn = QPushButton("移除仓库")
+        self.remove_repo_btn = self._track(QPushButton("移除仓库"))
         self.remove_repo_btn.clicked.connect(self.remove_repo)
-        self.clone_repo_btn = QPushButton("克隆仓库")  # 新增按钮
+        self.clone_repo_btn = self._track(QPushButton("克隆仓库"))  # 新增按钮
         self.clone_repo_btn.clicked.connect(self.clone_repo)  # 连接点击事件
-        self.refresh_btn = QPushButton("刷新")
+        self.refresh_btn = self._track(QPushButton("刷新"))
         self.refresh_btn.clicked.connect(self.refresh_current_repo)
 
         top_layout.addWidget(self.add_repo_btn)
@@ -658,7 +1576,7 @@ class GitManager(QWidget):
         self.new_branch_input.setPlaceholderText("新分支名")
         branch_control_layout.addWidget(self.new_branch_input)
 
-        self.create_branch_btn = QPushButton("创建分支")
+        self.create_branch_btn = self._track(QPushButton("创建分支"))
         self.create_branch_btn.clicked.connect(self.create_branch)
         branch_control_layout.addWidget(self.create_branch_btn)
         branch_layout.addLayout(branch_control_layout)
@@ -671,12 +1589,12 @@ class GitManager(QWidget):
         self.merge_combo = QComboBox()
         branch_remote_layout.addWidget(self.merge_combo)
 
-        self.merge_btn = QPushButton("合并到当前分支")
+        self.merge_btn = self._track(QPushButton("合并到当前分支"))
         self.merge_btn.clicked.connect(self.merge_branch)
         branch_remote_layout.addWidget(self.merge_btn)
 
         # 删除分支按钮
-        self.delete_branch_btn = QPushButton("删除分支")
+        self.delete_branch_btn = self._track(QPushButton("删除分支"))
         self.delete_branch_btn.clicked.connect(self.delete_branch)
         branch_remote_layout.addWidget(self.delete_branch_btn)
 
@@ -689,20 +1607,31 @@ class GitManager(QWidget):
         # 文件状态
         status_group = QGroupBox("文件状态")
         status_layout = QVBoxLayout()
-        self.status_table = QTableWidget(0, 3)
-        self.status_table.setHorizontalHeaderLabels(["状态", "文件", "图标"])
+        self.status_model = StatusModel(self)
+        self.status_table = QTableView()
+        self.status_table.setModel(self.status_model)
         self.status_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
-        self.status_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.status_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         # 添加双击和右键菜单事件
         self.status_table.setContextMenuPolicy(Qt.CustomContextMenu)
         self.status_table.customContextMenuRequested.connect(self.show_status_context_menu)
-        self.status_table.itemDoubleClicked.connect(self.show_file_diff)
+        # 右键菜单只创建一次，弹出时根据所在行调整可见的动作
+        self._menu_file = None  # 弹出菜单时所在行的 (状态, 文件路径)
+        self._row_menu = QMenu(self)
+        self._cancel_action = QAction("取消变更", self)
+        self._cancel_action.triggered.connect(self._on_cancel_current_row)
+        self._row_menu.addAction(self._cancel_action)
+        self._cancel_separator = self._row_menu.addSeparator()
+        self._diff_action = QAction("查看差异", self)
+        self._diff_action.triggered.connect(self._on_diff_current_row)
+        self._row_menu.addAction(self._diff_action)
+        self.status_table.doubleClicked.connect(self.show_file_diff)
         status_layout.addWidget(self.status_table)
 
         status_btn_layout = QHBoxLayout()
-        self.refresh_status_btn = QPushButton("刷新状态")
-        self.refresh_status_btn.clicked.connect(self.refresh_status)
-        self.stage_all_btn = QPushButton("暂存所有")
+        self.refresh_status_btn = self._track(QPushButton("刷新状态"))
+        self.refresh_status_btn.clicked.connect(lambda: self.refresh_status(force=True))
+        self.stage_all_btn = self._track(QPushButton("暂存所有"))
         self.stage_all_btn.clicked.connect(self.stage_all)
         status_btn_layout.addWidget(self.refresh_status_btn)
         status_btn_layout.addWidget(self.stage_all_btn)
@@ -721,9 +1650,9 @@ class GitManager(QWidget):
         commit_layout.addWidget(self.commit_message)
 
         commit_btn_layout = QHBoxLayout()
-        self.commit_btn = QPushButton("提交")
+        self.commit_btn = self._track(QPushButton("提交"))
         self.commit_btn.clicked.connect(self.commit)
-        self.commit_push_btn = QPushButton("提交并推送")
+        self.commit_push_btn = self._track(QPushButton("提交并推送"))
         self.commit_push_btn.clicked.connect(self.commit_and_push)
         commit_btn_layout.addWidget(self.commit_btn)
         commit_btn_layout.addWidget(self.commit_push_btn)
@@ -751,11 +1680,11 @@ class GitManager(QWidget):
 
         # 按钮
         remote_btn_layout = QHBoxLayout()
-        self.pull_btn = QPushButton("拉取")
+        self.pull_btn = self._track(QPushButton("拉取"))
         self.pull_btn.clicked.connect(self.pull)
-        self.push_btn = QPushButton("推送")
+        self.push_btn = self._track(QPushButton("推送"))
         self.push_btn.clicked.connect(self.push)
-        self.push_set_upstream_btn = QPushButton("推送并设置上游")
+        self.push_set_upstream_btn = self._track(QPushButton("推送并设置上游"))
         self.push_set_upstream_btn.clicked.connect(lambda: self.push(set_upstream=True))
         remote_btn_layout.addWidget(self.pull_btn)
         remote_btn_layout.addWidget(self.push_btn)
@@ -769,10 +1698,15 @@ class GitManager(QWidget):
         # 历史提交
         history_group = QGroupBox("历史提交")
         history_layout = QVBoxLayout()
-        self.history_list = QListWidget()
+        self.history_list = QListView()
+        self.history_model = CommitListModel(self.history_list)
+        self.history_list.setModel(self.history_model)
+        self.history_model.more_requested.connect(self.load_more_history)
+        self.history_list.setUniformItemSizes(True)
+        self.history_list.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.history_list.setContextMenuPolicy(Qt.CustomContextMenu)
         self.history_list.customContextMenuRequested.connect(self.show_history_context_menu)
-        self.history_list.itemDoubleClicked.connect(self.show_commit_detail)
+        self.history_list.doubleClicked.connect(self.show_commit_detail)
         history_layout.addWidget(self.history_list)
         history_group.setLayout(history_layout)
         right_layout.addWidget(history_group)
@@ -780,8 +1714,12 @@ class GitManager(QWidget):
         # 输出日志
         log_group = QGroupBox("输出日志")
         log_layout = QVBoxLayout()
-        self.log_output = QTextEdit()
+        # 纯文本日志并限制行数，超出后自动丢弃最早的行
+        self.log_output = QPlainTextEdit()
         self.log_output.setReadOnly(True)
+        self.log_output.setMaximumBlockCount(_LOG_MAX_LINES)
+        self.log_output.setCenterOnScroll(False)
+        self._last_log_message = None
         self.log_output.setMaximumHeight(80)
         log_layout.addWidget(self.log_output)
         log_group.setLayout(log_layout)
@@ -798,18 +1736,26 @@ class GitManager(QWidget):
 
     def log_message(self, message):
         """记录日志信息"""
+        # 连续重复的消息只记录一次
+        if message == self._last_log_message:
+            return
+        self._last_log_message = message
         timestamp = datetime.now().strftime("%H:%M:%S")
-        self.log_output.append(f"[{timestamp}] {message}")
-        self.log_output.moveCursor(self.log_output.textCursor().End)
+        self.log_output.appendPlainText(f"[{timestamp}] {message}")
+
+    def _track(self, button):
+        """登记会显示加载状态的按钮"""
+        self._loading_widgets.append(button)
+        self._orig_text[button] = button.text()
+        return button
 
     def set_button_loading(self, button, loading=True):
         """设置按钮加载状态"""
         if loading:
             button.setEnabled(False)
-            button.setText(button.text() + " 中...")
+            button.setText(self._orig_text[button] + " 中...")
         else:
-            original_text = button.text().replace(" 中...", "")
-            button.setText(original_text)
+            button.setText(self._orig_text[button])
             button.setEnabled(True)
 
     def set_combo_loading(self, combo, loading=True):
@@ -846,63 +1792,123 @@ class GitManager(QWidget):
         """加载仓库配置"""
         if os.path.exists(CONFIG_FILE):
             try:
-                with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
-                    self.repo_paths = json.load(f)
-                self.update_repo_list()
+                with open(CONFIG_FILE, 'rb') as f:
+                    self.repo_paths = _loads_json(f.read())
             except Exception as e:
                 self.log_message(f"加载配置失败: {str(e)}")
         else:
             self.repo_paths = []
 
+        # 上次运行未写入配置的变更记在变更日志中，应用后合并回配置文件
+        try:
+            if _ConfigWriter.replay_journal(self.repo_paths):
+                self._config_generation += 1
+                _ConfigWriter.compact(self.repo_paths, self._config_generation)
+        except Exception as e:
+            self.log_message(f"恢复配置变更失败: {str(e)}")
+        self.update_repo_list()
+
     def save_config(self):
-        """保存仓库配置"""
+        """保存仓库配置（延迟片刻后在后台写入）"""
+        self._save_timer.start()
+
+    def journal_repo_change(self, op, repo_path):
+        """立即记录一次仓库增删，并安排稍后写入完整配置"""
+        try:
+            _ConfigWriter.append_journal(op, repo_path)
+        except OSError as e:
+            log.warning('写入配置变更日志失败: %s', e)
+        self.save_config()
+
+    def flush_config(self):
+        """立即在后台写入当前配置"""
+        self._save_timer.stop()
+        self._config_generation += 1
+        req_id = self.register_request(
+            on_error=lambda error_msg: self.log_message(f"保存配置失败: {error_msg}"))
+        self.threadpool.start(ConfigSaveWorker(self.bus, req_id, self.repo_paths, self._config_generation))
+
+    def closeEvent(self, event):
+        # 退出前同步写入最终配置并清空变更日志（后台写入可能尚未完成）
+        self._save_timer.stop()
+        self._config_generation += 1
         try:
-            with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
-                json.dump(self.repo_paths, f, ensure_ascii=False, indent=2)
+            _ConfigWriter.compact(self.repo_paths, self._config_generation)
         except Exception as e:
-            self.log_message(f"保存配置失败: {str(e)}")
+            log.warning('保存配置失败: %s', e)
+        _RepoCache.close_all()
+        super().closeEvent(event)
 
     def update_repo_list(self):
         """更新仓库列表显示"""
         self.repo_list.clear()
         for path in self.repo_paths:
-            if os.path.exists(path):
-                item = QListWidgetItem(os.path.basename(path))
+            if self.path_exists(path):
+                name, tooltip = self.repo_meta(path)
+                item = QListWidgetItem(name)
                 item.setData(Qt.UserRole, path)
-                item.setToolTip(path)
+                item.setToolTip(tooltip)
                 self.repo_list.addItem(item)
 
+    def repo_meta(self, path):
+        """返回仓库的 (显示名称, 提示文字)，首次使用时计算并缓存"""
+        meta = self._repo_meta.get(path)
+        if meta is None:
+            meta = self._repo_meta[path] = (os.path.basename(path), path)
+        return meta
+
+    def repo_name(self, path):
+        """仓库的显示名称"""
+        return self.repo_meta(path)[0]
+
+    def path_exists(self, path):
+        """检查路径是否存在，短时间内重复检查时使用缓存结果"""
+        now = time.monotonic()
+        entry = self._exists_cache.get(path)
+        if entry is not None and now - entry[0] < _EXISTS_CACHE_TTL:
+            return entry[1]
+        exists = os.path.exists(path)
+        self._exists_cache[path] = (now, exists)
+        return exists
+
     def add_repo(self):
         """添加仓库（支持多选）"""
-        if "add_repo" in self.active_operations:
+        if self._active & Op.ADD_REPO:
             return
 
-        self.active_operations.add("add_repo")
+        self._active |= Op.ADD_REPO
         self.set_button_loading(self.add_repo_btn, True)
 
         # 使用单选模式避免Windows系统上的崩溃问题
         directory = QFileDialog.getExistingDirectory(self, "选择Git仓库目录")
-        if directory:
-            try:
-                # 检查是否为有效的Git仓库
-                repo = Repo(directory)
-                repo_path = repo.working_dir
-
-                # 检查是否已存在
-                if repo_path not in self.repo_paths:
-                    self.repo_paths.append(repo_path)
-                    self.save_config()
-                    self.update_repo_list()
-                    self.log_message(f"已添加仓库: {os.path.basename(repo_path)}")
-                else:
-                    self.log_message(f"仓库已存在: {os.path.basename(repo_path)}")
-            except InvalidGitRepositoryError:
+        if not directory:
+            self._active &= ~Op.ADD_REPO
+            self.set_button_loading(self.add_repo_btn, False)
+            return
+
+        def on_open_result(repo_path):
+            if repo_path is None:
                 QMessageBox.warning(self, "错误", f"选择的目录不是有效的Git仓库: {directory}")
-            except Exception as e:
-                self.log_message(f"添加仓库时出错: {str(e)}")
+            # 检查是否已存在
+            elif repo_path not in self.repo_paths:
+                self.repo_paths.append(repo_path)
+                self._exists_cache.pop(repo_path, None)
+                self.journal_repo_change("add", repo_path)
+                self.update_repo_list()
+                self.log_message(f"已添加仓库: {self.repo_name(repo_path)}")
+            else:
+                self.log_message(f"仓库已存在: {self.repo_name(repo_path)}")
+            self._active &= ~Op.ADD_REPO
+            self.set_button_loading(self.add_repo_btn, False)
+
+        def on_open_error(error_msg):
+            self.log_message(f"添加仓库时出错: {error_msg}")
+            self._active &= ~Op.ADD_REPO
+            self.set_button_loading(self.add_repo_btn, False)
 
-        self.active_operations.discard("add_repo")
-        self.set_button_loading(self.add_repo_btn, False)
+        # 在后台打开仓库以检查是否为有效的Git仓库
+        self.start_git_worker("open", on_result=on_open_result, on_error=on_open_error,
+                              repo_path=directory)
 
     def add_multiple_repos(self):
         """添加多个仓库（备用方法）"""
@@ -911,7 +1917,7 @@ class GitManager(QWidget):
 
     def remove_repo(self):
         """移除仓库"""
-        if "remove_repo" in self.active_operations:
+        if self._active & Op.REMOVE_REPO:
             return
 
         selected_items = self.repo_list.selectedItems()
@@ -919,7 +1925,7 @@ class GitManager(QWidget):
             self.log_message("请先选择要移除的仓库")
             return
 
-        self.active_operations.add("remove_repo")
+        self._active |= Op.REMOVE_REPO
         self.set_button_loading(self.remove_repo_btn, True)
 
         repo_paths_to_remove = [item.data(Qt.UserRole) for item in selected_items]
@@ -934,7 +1940,11 @@ class GitManager(QWidget):
             for repo_path in repo_paths_to_remove:
                 if repo_path in self.repo_paths:
                     self.repo_paths.remove(repo_path)
-                    removed_repos.append(repo_path)
+                    self.journal_repo_change("remove", repo_path)
+                    self._exists_cache.pop(repo_path, None)
+                    _RepoCache.invalidate(repo_path)
+                    removed_repos.append(self.repo_name(repo_path))
+                    self._repo_meta.pop(repo_path, None)
 
                     # 如果当前选中的是被删除的仓库，清除当前仓库信息
                     if self.current_repo_path == repo_path:
@@ -943,23 +1953,22 @@ class GitManager(QWidget):
                         self.repo_info_label.setText("请选择一个仓库")
                         self.clear_repo_info()
 
-            self.save_config()
             self.update_repo_list()
             self.log_message(
-                f"已移除 {len(removed_repos)} 个仓库: {', '.join([os.path.basename(p) for p in removed_repos])}")
+                f"已移除 {len(removed_repos)} 个仓库: {', '.join(removed_repos)}")
 
-        self.active_operations.discard("remove_repo")
+        self._active &= ~Op.REMOVE_REPO
         self.set_button_loading(self.remove_repo_btn, False)
 
     def on_repo_selected(self, current, previous):
         """仓库选择事件"""
         if current:
             repo_path = current.data(Qt.UserRole)
-            if os.path.exists(repo_path):
+            if self.path_exists(repo_path):
                 try:
-                    self.current_repo = Repo(repo_path)
+                    self.current_repo = _RepoCache.get(repo_path)
                     self.current_repo_path = repo_path
-                    self.repo_info_label.setText(f"当前仓库: {os.path.basename(repo_path)}")
+                    self.repo_info_label.setText(f"当前仓库: {self.repo_name(repo_path)}")
                     self.refresh_current_repo()
                     self.log_message(f"已选择仓库: {repo_path}")
                 except Exception as e:
@@ -978,44 +1987,211 @@ class GitManager(QWidget):
     def clear_repo_info(self):
         """清空仓库信息显示"""
         self.branch_combo.clear()
+        self._branch_display = {}
         self.merge_combo.clear()
-        self.status_table.setRowCount(0)
-        self.history_list.clear()
+        self.status_model.set_rows([])
+        self.history_model.set_rows([])
         self.commit_message.clear()
 
     def refresh_current_repo(self):
-        """刷新当前仓库信息"""
-        if "refresh" in self.active_operations:
+        """刷新当前仓库信息（用户主动刷新时丢弃全部缓存，重新读取状态、分支和历史）"""
+        self._status_stamp = None
+        if self.current_repo_path:
+            # 查询缓存的时间戳不包含嵌套的引用目录（如 refs/heads/feature/x），主动刷新时直接作废
+            self.invalidate_query_cache(self.current_repo_path)
+            _StatusCache.invalidate(self.current_repo_path)
+        self.schedule_refresh(_REFRESH_ALL)
+
+    def schedule_refresh(self, parts=_REFRESH_ALL):
+        """登记需要刷新的区域，最后一次请求后延迟片刻统一刷新"""
+        self._refresh_dirty |= parts
+        # 每次请求都重新计时，连续的写操作只触发一次刷新
+        self._refresh_timer.start()
+
+    def _do_refresh(self):
+        parts, self._refresh_dirty = self._refresh_dirty, 0
+        if not (self.current_repo and self.current_repo_path):
             return
 
-        if self.current_repo and self.current_repo_path:
-            self.active_operations.add("refresh")
-            self.set_button_loading(self.refresh_btn, True)
-
+        if parts & _REFRESH_BRANCHES:
             self.refresh_branches()
+        if parts & _REFRESH_STATUS:
             self.refresh_status()
+        if parts & _REFRESH_HISTORY:
             self.refresh_history()
 
-            self.active_operations.discard("refresh")
-            self.set_button_loading(self.refresh_btn, False)
-
-    def execute_git_task(self, operation, *args, callback=None):
-        """执行Git任务"""
+    def execute_git_task(self, operation, *args, callback=None, on_error=None, on_progress=None):
+        """执行Git任务；on_error 在通用错误处理之前调用，on_progress 默认写入日志"""
         if not self.current_repo_path:
             self.log_message("请先选择一个仓库")
             return
 
+        # 相同的操作正在执行时不再重复启动，结果返回后一并回调（错误只由首次请求处理一次）
+        waiters = self._inflight.get((self.current_repo_path, operation) + args)
+        if waiters is not None:
+            if callback:
+                waiters.append((callback, None))
+            return
+
+        # 分支和历史在相关 .git 文件未变化时直接使用缓存结果
+        stamp = None
+        if operation in _CACHED_QUERIES and not args:
+            stamp = self.query_stamp()
+            entry = self._query_cache.get(self.current_repo_path, {}).get(operation)
+            if (stamp is not None and entry and entry[0] == stamp
+                    and time.monotonic() - entry[1] < _QUERY_CACHE_TTL):
+                if callback:
+                    QTimer.singleShot(0, partial(callback, entry[2]))
+                return
+        repo_path = self.current_repo_path
+
         # 立即提供反馈
         self.log_message(f"准备执行 {operation} 操作...")
 
-        worker = GitWorker(self.current_repo_path, operation, *args)
-        if callback:
-            worker.signals.result.connect(callback)
-        worker.signals.error.connect(self.handle_git_error)
-        worker.signals.progress.connect(self.log_message)
-        self.threadpool.start(worker)
-        # 强制处理事件以立即显示日志
-        QApplication.processEvents()
+        def on_result(result):
+            if stamp is not None:
+                self._query_cache.setdefault(repo_path, {})[operation] = (stamp, time.monotonic(), result)
+            if callback:
+                callback(result)
+
+        error_callback = on_error
+
+        def on_error(error_msg):
+            if error_callback:
+                error_callback(error_msg)
+            self.handle_git_error(error_msg)
+
+        self.start_git_worker(operation, *args, on_result=on_result,
+                              on_error=on_error, on_progress=on_progress or self.log_message)
+
+    def query_stamp(self):
+        """读取 HEAD、index、引用及其日志的修改时间，作为查询缓存的键"""
+        if self.current_repo is None:
+            return None
+        git_dir = self.current_repo.git_dir
+        common_dir = self.current_repo.common_dir
+        paths = (
+            os.path.join(git_dir, 'HEAD'),
+            os.path.join(git_dir, 'index'),
+            os.path.join(git_dir, 'logs', 'HEAD'),
+            os.path.join(common_dir, 'packed-refs'),
+            os.path.join(common_dir, 'refs', 'heads'),
+            os.path.join(common_dir, 'refs', 'remotes'),
+            os.path.join(common_dir, 'FETCH_HEAD'),
+        )
+        stamp = []
+        for path in paths:
+            try:
+                stamp.append(os.stat(path).st_mtime_ns)
+            except OSError:
+                stamp.append(None)
+        return tuple(stamp)
+
+    def invalidate_query_cache(self, repo_path):
+        """丢弃仓库的分支和历史缓存"""
+        self._query_cache.pop(repo_path, None)
+        if self._status_stamp and self._status_stamp[0] == repo_path:
+            self._status_stamp = None
+        for cache_key in [k for k in self._git_cache if k[0] == repo_path]:
+            del self._git_cache[cache_key]
+
+    def _cache_get(self, repo_path, op, key, ttl):
+        """读取未过期的缓存结果，未命中时返回 None"""
+        entry = self._git_cache.get((repo_path, op, key))
+        if entry is not None and time.monotonic() - entry[0] < ttl:
+            return entry[1]
+        return None
+
+    def _cache_put(self, repo_path, op, key, value):
+        self._git_cache[(repo_path, op, key)] = (time.monotonic(), value)
+
+    def status_stamp(self):
+        """读取当前仓库 index 与 HEAD 的修改时间（Repo.git_dir 已解析 .git 指向文件）"""
+        if self.current_repo is None:
+            return None
+        git_dir = self.current_repo.git_dir
+        try:
+            return (self.current_repo_path,
+                    os.stat(os.path.join(git_dir, 'index')).st_mtime_ns,
+                    os.stat(os.path.join(git_dir, 'HEAD')).st_mtime_ns)
+        except OSError:
+            return None
+
+    def register_request(self, on_result=None, on_error=None, on_progress=None, on_chunk=None):
+        """登记一次后台请求的回调，返回请求编号"""
+        req_id = next(self._req_ids)
+        self._callbacks[req_id] = (on_result, on_error, on_progress, on_chunk)
+        return req_id
+
+    def start_git_worker(self, operation, *args, on_result=None, on_error=None, on_progress=None,
+                         on_chunk=None, repo_path=None):
+        """启动Git工作线程，默认作用于当前仓库"""
+        repo_path = repo_path or self.current_repo_path
+        # 相同的请求正在执行时只登记回调，不再启动新的 git 进程；
+        # 分块输出的请求无法补发已发送的部分，不参与合并
+        if on_chunk is None:
+            key = (repo_path, operation) + args
+            waiters = self._inflight.get(key)
+            if waiters is not None:
+                waiters.append((on_result, on_error))
+                return
+            waiters = self._inflight[key] = []
+            on_result = self._notify_inflight(key, waiters, on_result, 0)
+            on_error = self._notify_inflight(key, waiters, on_error, 1)
+        if operation not in _READ_ONLY_OPERATIONS:
+            # 修改仓库的操作结束后（无论成败）丢弃查询缓存
+            on_result = self._after_write(repo_path, on_result)
+            on_error = self._after_write(repo_path, on_error)
+        req_id = self.register_request(on_result, on_error, on_progress, on_chunk)
+        worker = GitWorker(self.bus, req_id, repo_path, operation, *args)
+        self.pool_for(operation).start(worker, _OPERATION_PRIORITY.get(operation, _DEFAULT_PRIORITY))
+
+    def _notify_inflight(self, key, waiters, callback, slot):
+        """请求结束：清除运行标记，并把结果交给合并进来的重复请求"""
+        def notify(value):
+            if self._inflight.get(key) is waiters:
+                del self._inflight[key]
+            try:
+                if callback:
+                    callback(value)
+            finally:
+                for waiter in waiters:
+                    if waiter[slot]:
+                        waiter[slot](value)
+        return notify
+
+    def _after_write(self, repo_path, callback):
+        def wrapped(value):
+            self.invalidate_query_cache(repo_path)
+            if callback:
+                callback(value)
+        return wrapped
+
+    def on_bus_result(self, req_id, result):
+        callbacks = self._callbacks.pop(req_id, None)
+        if callbacks and callbacks[0]:
+            callbacks[0](result)
+
+    def on_bus_error(self, req_id, error_msg):
+        callbacks = self._callbacks.pop(req_id, None)
+        if callbacks and callbacks[1]:
+            callbacks[1](error_msg)
+
+    def on_bus_progress(self, req_id, message):
+        callbacks = self._callbacks.get(req_id)
+        if callbacks and callbacks[2]:
+            callbacks[2](message)
+
+    def on_bus_chunk(self, req_id, text):
+        callbacks = self._callbacks.get(req_id)
+        if callbacks and callbacks[3]:
+            callbacks[3](text)
+
+    def pool_for(self, operation):
+        """根据操作类型选择线程池"""
+        if operation in _NETWORK_OPERATIONS:
+            return self.net_threadpool
+        return self.threadpool
 
     def handle_git_error(self, error_msg):
         """处理Git操作错误"""
@@ -1060,23 +2236,11 @@ class GitManager(QWidget):
     def reset_all_buttons(self):
         """重置所有按钮到正常状态"""
         # 移除所有操作标记
-        self.active_operations.clear()
+        self._active = Op(0)
 
         # 重置所有按钮
-        self.set_button_loading(self.add_repo_btn, False)
-        self.set_button_loading(self.remove_repo_btn, False)
-        self.set_button_loading(self.refresh_btn, False)
-        self.set_button_loading(self.refresh_status_btn, False)
-        self.set_button_loading(self.stage_all_btn, False)
-        self.set_button_loading(self.commit_btn, False)
-        self.set_button_loading(self.commit_push_btn, False)
-        self.set_button_loading(self.pull_btn, False)
-        self.set_button_loading(self.push_btn, False)
-        self.set_button_loading(self.push_set_upstream_btn, False)
-        self.set_button_loading(self.create_branch_btn, False)
-        self.set_button_loading(self.merge_btn, False)
-        self.set_button_loading(self.clone_repo_btn, False)
-        self.set_button_loading(self.delete_branch_btn, False)
+        for button in self._loading_widgets:
+            self.set_button_loading(button, False)
 
         # 重置组合框
         self.set_combo_loading(self.branch_combo, False)
@@ -1087,25 +2251,29 @@ class GitManager(QWidget):
 
     def refresh_branches(self):
         """刷新分支信息"""
+        repo_path = self.current_repo_path
+        if (repo_path, "branches") in self._inflight:
+            # 已有分支查询在执行，其结果可能早于本次写操作，返回后再查一次
+            self._refresh_rerun |= _REFRESH_BRANCHES
+            return
 
         def on_branches_result(result):
-            # 更新分支切换下拉框
-            self.branch_combo.blockSignals(True)
-            self.branch_combo.clear()
-
             local_branches = result.get('local_branches', [])
             remote_branches = result.get('remote_branches', [])
             active_branch = result.get('active_branch', None)
 
-            # 添加本地分支
-            for branch in local_branches:
-                self.branch_combo.addItem(f"localctx: {branch}", branch)
+            # 分支名 -> 显示文本，切换分支时据此判断是否为远程分支
+            self._branch_display = {branch: f"localctx: {branch}" for branch in local_branches}
+            self._branch_display.update((branch, f"remote: {branch}") for branch in remote_branches)
 
-            # 添加远程分支
+            # 先在界面外构建完整模型，再一次性设置到分支切换下拉框
+            items = [_combo_item(self._branch_display[branch], branch) for branch in local_branches]
             if remote_branches:
-                self.branch_combo.insertSeparator(len(local_branches))  # 添加分隔符
-                for branch in remote_branches:
-                    self.branch_combo.addItem(f"remote: {branch}", branch)
+                items.append(_combo_separator())
+                items.extend(_combo_item(self._branch_display[branch], branch) for branch in remote_branches)
+
+            self.branch_combo.blockSignals(True)
+            self.branch_combo.setModel(_combo_model(items, self.branch_combo))
 
             # 设置当前活动分支
             if active_branch:
@@ -1116,36 +2284,51 @@ class GitManager(QWidget):
             self.branch_combo.blockSignals(False)
 
             # 更新合并下拉框（不包含当前分支）
-            self.merge_combo.clear()
             current_branch = active_branch or ""
-            all_branches = local_branches + remote_branches
-            for branch in all_branches:
-                if branch != current_branch:
-                    self.merge_combo.addItem(branch, branch)
+            merge_items = [_combo_item(branch, branch) for branch in local_branches + remote_branches
+                           if branch != current_branch]
+            self.merge_combo.setModel(_combo_model(merge_items, self.merge_combo))
+
+            if self._refresh_rerun & _REFRESH_BRANCHES:
+                self._refresh_rerun &= ~_REFRESH_BRANCHES
+                self.refresh_branches()
 
         self.execute_git_task("branches", callback=on_branches_result)
 
+    def _cached_local_branches(self):
+        """返回 (本地分支列表, 当前分支)；HEAD 与引用文件未变化时复用分支刷新缓存的查询结果"""
+        stamp = self.query_stamp()
+        entry = self._query_cache.get(self.current_repo_path, {}).get("branches")
+        if (stamp is not None and entry and entry[0] == stamp
+                and time.monotonic() - entry[1] < _QUERY_CACHE_TTL):
+            return entry[2].get('local_branches', []), entry[2].get('active_branch')
+        return self._read_local_branches()
+
+    def _read_local_branches(self):
+        raw = self.current_repo.git.for_each_ref('--format=%(HEAD)%(refname:short)', 'refs/heads/',
+                                                 env=_READ_ONLY_GIT_ENV)
+        local_branches = []
+        active_branch = None
+        for line in raw.splitlines():
+            name = line[1:]
+            local_branches.append(name)
+            if line[0] == '*':
+                active_branch = name
+        return local_branches, active_branch
+
     def on_branch_activated(self, index):
         """当用户从下拉框中选择一个分支时触发"""
         # 避免重复操作
-        if "switch_branch" in self.active_operations:
+        if self._active & Op.SWITCH_BRANCH:
             return
 
         if index < 0:
             return
 
-        # 获取存储的分支名数据
+        # 获取存储的分支名数据（分隔行没有数据）
         branch_name = self.branch_combo.itemData(index)
-        if not branch_name:
-            # 如果没有数据，使用显示文本
-            branch_name = self.branch_combo.itemText(index)
-            # 移除前缀
-            if branch_name.startswith("localctx: "):
-                branch_name = branch_name[9:]  # 去掉 "localctx: " 前缀
-            elif branch_name.startswith("remote: "):
-                branch_name = branch_name[8:]  # 去掉 "remote: " 前缀
-
-        self.switch_branch(branch_name)
+        if branch_name:
+            self.switch_branch(branch_name)
 
     def switch_branch(self, branch_name):
         """切换分支 - 直接携带更改到新分支"""
@@ -1153,19 +2336,15 @@ class GitManager(QWidget):
             return
 
         # 检查是否是远程分支
-        combo_text = ""
-        for i in range(self.branch_combo.count()):
-            if self.branch_combo.itemData(i) == branch_name:
-                combo_text = self.branch_combo.itemText(i)
-                break
+        combo_text = self._branch_display.get(branch_name, "")
 
-        self.active_operations.add("switch_branch")
+        self._active |= Op.SWITCH_BRANCH
         self.set_combo_loading(self.branch_combo, True)
 
         def on_checkout_result(result):
             self.log_message(result)
-            self.refresh_current_repo()
-            self.active_operations.discard("switch_branch")
+            self.schedule_refresh()
+            self._active &= ~Op.SWITCH_BRANCH
             self.set_combo_loading(self.branch_combo, False)
 
         def on_checkout_error(error_msg):
@@ -1174,10 +2353,10 @@ class GitManager(QWidget):
             if "Your local changes to the following files would be overwritten by checkout" in error_msg:
                 QMessageBox.critical(self, "切换分支失败",
                                    f"无法将更改带到新分支，因为以下文件存在冲突：\n\n{error_msg}")
-            self.active_operations.discard("switch_branch")
+            self._active &= ~Op.SWITCH_BRANCH
             self.set_combo_loading(self.branch_combo, False)
             # 刷新当前状态以确保UI同步
-            self.refresh_current_repo()
+            self.schedule_refresh()
 
         # 直接执行分支切换，尝试携带更改
         if combo_text.startswith("remote: "):
@@ -1190,32 +2369,27 @@ class GitManager(QWidget):
                 actual_branch_name = branch_name
 
             # 检查是否已存在同名本地分支
-            local_branch_exists = False
             try:
-                for branch in self.current_repo.branches:
-                    if branch.name == actual_branch_name:
-                        local_branch_exists = True
-                        break
-            except:
-                pass
+                local_branch_exists = actual_branch_name in self._cached_local_branches()[0]
+            except Exception:
+                local_branch_exists = False
 
             if not local_branch_exists:
                 # 创建本地跟踪分支
-                worker = GitWorker(self.current_repo_path, "checkout", "-b", actual_branch_name, branch_name)
+                checkout_args = ("-b", actual_branch_name, branch_name)
             else:
                 # 直接切换到已存在的本地分支
-                worker = GitWorker(self.current_repo_path, "checkout", actual_branch_name)
+                checkout_args = (actual_branch_name,)
         else:
             # 切换到本地分支
-            worker = GitWorker(self.current_repo_path, "checkout", branch_name)
+            checkout_args = (branch_name,)
 
-        worker.signals.result.connect(on_checkout_result)
-        worker.signals.error.connect(on_checkout_error)
-        self.threadpool.start(worker)
+        self.start_git_worker("checkout", *checkout_args,
+                              on_result=on_checkout_result, on_error=on_checkout_error)
 
     def create_branch(self):
         """创建新分支"""
-        if "create_branch" in self.active_operations:
+        if self._active & Op.CREATE_BRANCH:
             return
 
         branch_name = self.new_branch_input.text().strip()
@@ -1223,21 +2397,21 @@ class GitManager(QWidget):
             self.log_message("请输入分支名称")
             return
 
-        self.active_operations.add("create_branch")
+        self._active |= Op.CREATE_BRANCH
         self.set_button_loading(self.create_branch_btn, True)
 
         def on_create_result(result):
             self.log_message(result)
             self.new_branch_input.clear()
-            self.refresh_branches()
-            self.active_operations.discard("create_branch")
+            self.schedule_refresh(_REFRESH_BRANCHES)
+            self._active &= ~Op.CREATE_BRANCH
             self.set_button_loading(self.create_branch_btn, False)
 
         self.execute_git_task("create_branch", branch_name, callback=on_create_result)
 
     def merge_branch(self):
         """合并分支"""
-        if "merge_branch" in self.active_operations:
+        if self._active & Op.MERGE_BRANCH:
             return
 
         branch_name = self.merge_combo.currentText()
@@ -1250,7 +2424,7 @@ class GitManager(QWidget):
             self.log_message("不能合并当前分支到自身")
             return
 
-        self.active_operations.add("merge_branch")
+        self._active |= Op.MERGE_BRANCH
         self.set_button_loading(self.merge_btn, True)
 
         reply = QMessageBox.question(
@@ -1259,49 +2433,62 @@ class GitManager(QWidget):
             QMessageBox.Yes | QMessageBox.No
         )
         if reply == QMessageBox.No:
-            self.active_operations.discard("merge_branch")
+            self._active &= ~Op.MERGE_BRANCH
             self.set_button_loading(self.merge_btn, False)
             return
 
         def on_merge_result(result):
             self.log_message(result)
-            self.refresh_current_repo()
-            self.active_operations.discard("merge_branch")
+            self.schedule_refresh()
+            self._active &= ~Op.MERGE_BRANCH
             self.set_button_loading(self.merge_btn, False)
 
         self.execute_git_task("merge", branch_name, callback=on_merge_result)
 
-    def refresh_status(self):
-        """刷新文件状态"""
-        if "refresh_status" in self.active_operations:
+    def refresh_status(self, force=False):
+        """刷新文件状态；非强制刷新时 index 与 HEAD 未变化则跳过"""
+        if self._active & Op.REFRESH_STATUS:
+            # 正在刷新时记下请求，本次结果返回后强制再刷新一次
+            self._refresh_rerun |= _REFRESH_STATUS
             return
 
-        self.active_operations.add("refresh_status")
+        stamp = self.status_stamp()
+        if (not force and stamp is not None and stamp == self._status_stamp
+                and self.status_model.rowCount() > 0):
+            return
+
+        self._active |= Op.REFRESH_STATUS
         self.set_button_loading(self.refresh_status_btn, True)
 
         def on_status_result(result):
-            self.status_table.setRowCount(len(result))
-            for row, (status, file_path, icon) in enumerate(result):
-                self.status_table.setItem(row, 0, QTableWidgetItem(status))
-                self.status_table.setItem(row, 1, QTableWidgetItem(file_path))
-                self.status_table.setItem(row, 2, QTableWidgetItem(icon))
-            self.active_operations.discard("refresh_status")
+            self._status_stamp = stamp
+            # 批量更新期间暂停表格重绘，结束后统一绘制一次
+            self.status_table.setUpdatesEnabled(False)
+            try:
+                self.status_model.set_rows(result)
+            finally:
+                self.status_table.setUpdatesEnabled(True)
+            self._active &= ~Op.REFRESH_STATUS
             self.set_button_loading(self.refresh_status_btn, False)
 
-        self.execute_git_task("status", callback=on_status_result)
+            if self._refresh_rerun & _REFRESH_STATUS:
+                self._refresh_rerun &= ~_REFRESH_STATUS
+                self.refresh_status(force=True)
+
+        self.execute_git_task("status", force, callback=on_status_result)
 
     def stage_all(self):
         """暂存所有文件"""
-        if "stage_all" in self.active_operations:
+        if self._active & Op.STAGE_ALL:
             return
 
-        self.active_operations.add("stage_all")
+        self._active |= Op.STAGE_ALL
         self.set_button_loading(self.stage_all_btn, True)
 
         def on_add_result(result):
             self.log_message(result)
-            self.refresh_status()
-            self.active_operations.discard("stage_all")
+            self.schedule_refresh(_REFRESH_STATUS)
+            self._active &= ~Op.STAGE_ALL
             self.set_button_loading(self.stage_all_btn, False)
 
         self.execute_git_task("add", callback=on_add_result)
@@ -1310,22 +2497,36 @@ class GitManager(QWidget):
         """刷新提交历史"""
 
         def on_log_result(result):
-            self.history_list.clear()
-            for commit in result:
-                item_text = f"{commit['hash']} - {commit['message']}"
-                item = QListWidgetItem(item_text)
-                item.setData(Qt.UserRole, commit)
-                self.history_list.addItem(item)
+            self.history_model.set_rows(result, has_more=len(result) >= _LOG_PAGE_SIZE)
 
         self.execute_git_task("log", callback=on_log_result)
 
+    def load_more_history(self, skip):
+        """加载下一页提交历史"""
+        generation = self.history_model.generation
+
+        def on_page_result(result):
+            self.history_model.append_rows(result, generation, len(result) >= _LOG_PAGE_SIZE)
+
+        def on_page_error(error_msg):
+            # 滚动加载失败只写日志，不弹出对话框；清除加载标记，之后滚动时可重试
+            self.log_message(f"加载更多历史失败: {error_msg}")
+            if generation == self.history_model.generation:
+                self.history_model.fetching = False
+
+        if not self.current_repo_path:
+            self.history_model.fetching = False
+            return
+        self.start_git_worker("log", skip, _LOG_PAGE_SIZE, on_result=on_page_result,
+                              on_error=on_page_error, on_progress=self.log_message)
+
     def show_history_context_menu(self, position):
         """显示历史提交右键菜单"""
-        item = self.history_list.itemAt(position)
-        if not item:
+        index = self.history_list.indexAt(position)
+        if not index.isValid():
             return
 
-        commit_data = item.data(Qt.UserRole)
+        commit_data = index.data(Qt.UserRole)
         if not commit_data:
             return
 
@@ -1333,21 +2534,21 @@ class GitManager(QWidget):
 
         # 查看详情
         view_action = QAction("查看详情", self)
-        view_action.triggered.connect(lambda: self.show_commit_detail(item))
+        view_action.triggered.connect(partial(self.show_commit_detail, index))
         menu.addAction(view_action)
 
         menu.addSeparator()
 
         # Cherry-pick 操作
         cherry_pick_action = QAction("Cherry-pick 到其他分支", self)
-        cherry_pick_action.triggered.connect(lambda: self.cherry_pick_commit(commit_data))
+        cherry_pick_action.triggered.connect(partial(self.cherry_pick_commit, commit_data))
         menu.addAction(cherry_pick_action)
 
         menu.exec_(self.history_list.mapToGlobal(position))
 
     def cherry_pick_commit(self, commit_data):
         """Cherry-pick 提交到其他分支"""
-        if "cherry_pick" in self.active_operations:
+        if self._active & Op.CHERRY_PICK:
             return
 
         # 获取所有分支
@@ -1355,8 +2556,7 @@ class GitManager(QWidget):
             self.log_message("请先选择一个仓库")
             return
 
-        branches = [branch.name for branch in self.current_repo.branches]
-        current_branch = self.current_repo.active_branch.name
+        branches, current_branch = self._cached_local_branches()
 
         # 移除当前分支
         other_branches = [branch for branch in branches if branch != current_branch]
@@ -1382,48 +2582,48 @@ class GitManager(QWidget):
         reply = QMessageBox.question(
             self,
             "确认 Cherry-pick",
-            f"确定要将提交 {commit_data['hash']} cherry-pick 到分支 '{branch}' 吗？",
+            f"确定要将提交 {commit_data.hash} cherry-pick 到分支 '{branch}' 吗？",
             QMessageBox.Yes | QMessageBox.No
         )
 
         if reply == QMessageBox.No:
             return
 
-        self.active_operations.add("cherry_pick")
-        self.log_message(f"正在 cherry-pick 提交 {commit_data['hash']} 到分支 {branch}...")
+        self._active |= Op.CHERRY_PICK
+        self.log_message(f"正在 cherry-pick 提交 {commit_data.hash} 到分支 {branch}...")
 
         def on_cherry_pick_result(result):
             self.log_message(result)
-            self.active_operations.discard("cherry_pick")
+            self._active &= ~Op.CHERRY_PICK
             # 刷新当前分支信息
-            self.refresh_current_repo()
+            self.schedule_refresh()
 
         # 执行 cherry-pick 操作
-        self.execute_git_task("cherry_pick", commit_data['full_hash'], callback=on_cherry_pick_result)
+        self.execute_git_task("cherry_pick", commit_data.full_hash, callback=on_cherry_pick_result)
 
-    def show_commit_detail(self, item):
+    def show_commit_detail(self, index):
         """显示提交详情"""
-        if "show_commit" in self.active_operations:
+        if self._active & Op.SHOW_COMMIT:
             return
 
-        commit_data = item.data(Qt.UserRole)
+        commit_data = index.data(Qt.UserRole)
+        if not commit_data:
+            return
 
-        self.active_operations.add("show_commit")
+        self._active |= Op.SHOW_COMMIT
 
         # 禁用历史列表以防止重复双击
         self.history_list.setEnabled(False)
-        # 更新选中项的文本显示加载状态
-        item.setText(item.text() + " (加载中...)")
+        # 选中行显示加载状态
+        self.history_model.set_loading_row(index.row())
 
         def on_commit_detail_result(result):
             dialog = CommitDetailDialog(result, self)
             dialog.exec_()
-            self.active_operations.discard("show_commit")
+            self._active &= ~Op.SHOW_COMMIT
             # 恢复历史列表状态
             self.history_list.setEnabled(True)
-            # 恢复项目文本
-            original_text = item.text().replace(" (加载中...)", "")
-            item.setText(original_text)
+            self.history_model.set_loading_row(-1)
 
         def on_error(error_msg):
             self.log_message(f"获取提交详情失败: {error_msg}")
@@ -1434,21 +2634,16 @@ class GitManager(QWidget):
             }
             dialog = CommitDetailDialog(basic_info, self)
             dialog.exec_()
-            self.active_operations.discard("show_commit")
+            self._active &= ~Op.SHOW_COMMIT
             # 恢复历史列表状态
             self.history_list.setEnabled(True)
-            # 恢复项目文本
-            original_text = item.text().replace(" (加载中...)", "")
-            item.setText(original_text)
+            self.history_model.set_loading_row(-1)
 
-        worker = GitWorker(self.current_repo_path, "show_commit", commit_data['full_hash'])
-        worker.signals.result.connect(on_commit_detail_result)
-        worker.signals.error.connect(on_error)
-        self.threadpool.start(worker)
+        self.start_git_worker("show_commit", commit_data.full_hash, on_result=on_commit_detail_result, on_error=on_error)
 
     def commit(self):
         """提交"""
-        if "commit" in self.active_operations:
+        if self._active & Op.COMMIT:
             return
 
         message = self.commit_message.toPlainText().strip()
@@ -1456,59 +2651,50 @@ class GitManager(QWidget):
             self.log_message("请输入提交信息")
             return
 
-        self.active_operations.add("commit")
+        self._active |= Op.COMMIT
         self.set_button_loading(self.commit_btn, True)
 
         def on_commit_result(result):
             self.log_message(result)
             self.commit_message.clear()
-            self.refresh_status()
-            self.refresh_history()
-            self.active_operations.discard("commit")
+            self.schedule_refresh(_REFRESH_STATUS | _REFRESH_HISTORY)
+            self._active &= ~Op.COMMIT
             self.set_button_loading(self.commit_btn, False)
 
         self.execute_git_task("commit", message, callback=on_commit_result)
 
     def commit_and_push(self):
         """提交并推送（包含add .）"""
-        if "commit_and_push" in self.active_operations:
+        if self._active & Op.COMMIT_AND_PUSH:
             return
 
-        self.active_operations.add("commit_and_push")
-        self.set_button_loading(self.commit_push_btn, True)
-
-        def on_add_result(result):
-            self.log_message(result)
+        message = self.commit_message.toPlainText().strip()
+        if not message:
+            self.log_message("请输入提交信息")
+            return
 
-            def on_commit_result(commit_result):
-                self.log_message(commit_result)
-                self.commit_message.clear()
-                self.refresh_status()
-                self.refresh_history()
-
-                # 提交成功后推送
-                def on_push_result(push_result):
-                    self.log_message(push_result)
-                    self.active_operations.discard("commit_and_push")
-                    self.set_button_loading(self.commit_push_btn, False)
-
-                self.execute_git_task("push", callback=on_push_result)
-
-            message = self.commit_message.toPlainText().strip()
-            if not message:
-                self.log_message("请输入提交信息")
-                self.active_operations.discard("commit_and_push")
-                self.set_button_loading(self.commit_push_btn, False)
-                return
+        self._active |= Op.COMMIT_AND_PUSH
+        self.set_button_loading(self.commit_push_btn, True)
 
-            self.execute_git_task("commit", message, callback=on_commit_result)
+        def on_push_result(result):
+            # 有结果即表示提交已经完成，推送是否成功都清空提交信息并刷新状态和历史
+            self.log_message(result.message)
+            self.commit_message.clear()
+            self.schedule_refresh(_REFRESH_STATUS | _REFRESH_HISTORY)
+            self._active &= ~Op.COMMIT_AND_PUSH
+            self.set_button_loading(self.commit_push_btn, False)
+            if result.push_error is None:
+                self.log_message("推送成功")
+            else:
+                # 推送失败（如没有上游分支）
+                self.handle_git_error(result.push_error)
 
-        # 先执行 add .
-        self.execute_git_task("add", callback=on_add_result)
+        # add .、commit、push 在同一个后台任务中完成
+        self.execute_git_task("add_commit_push", message, callback=on_push_result)
 
     def pull(self):
         """拉取"""
-        if "pull" in self.active_operations:
+        if self._active & Op.PULL:
             return
 
         if not self.current_repo_path:
@@ -1519,13 +2705,13 @@ class GitManager(QWidget):
         rebase = self.pull_rebase_checkbox.isChecked()
         prune = self.pull_prune_checkbox.isChecked()
 
-        self.active_operations.add("pull")
+        self._active |= Op.PULL
         self.set_button_loading(self.pull_btn, True)
 
         def on_pull_result(result):
             self.log_message(result)
-            self.refresh_current_repo()
-            self.active_operations.discard("pull")
+            self.schedule_refresh()
+            self._active &= ~Op.PULL
             self.set_button_loading(self.pull_btn, False)
 
         # 传递拉取选项参数
@@ -1533,20 +2719,20 @@ class GitManager(QWidget):
 
     def push(self, set_upstream=False):
         """推送"""
-        if "push" in self.active_operations:
+        if self._active & Op.PUSH:
             return
 
         if not self.current_repo_path:
             self.log_message("请先选择一个仓库")
             return
 
-        self.active_operations.add("push")
+        self._active |= Op.PUSH
         self.set_button_loading(self.push_btn, True)
         self.set_button_loading(self.push_set_upstream_btn, True)
 
         def on_push_result(result):
             self.log_message(result)
-            self.active_operations.discard("push")
+            self._active &= ~Op.PUSH
             self.set_button_loading(self.push_btn, False)
             self.set_button_loading(self.push_set_upstream_btn, False)
 
@@ -1554,164 +2740,165 @@ class GitManager(QWidget):
         operation = "push_with_upstream" if set_upstream else "push"
         self.execute_git_task(operation, callback=on_push_result)
 
-    def show_file_diff(self, item):
+    def show_file_diff(self, index):
         """双击文件显示差异"""
-        # 获取行号
-        row = item.row()
-        # 获取文件状态和路径
-        status_item = self.status_table.item(row, 0)
-        file_item = self.status_table.item(row, 1)
-
-        if not status_item or not file_item:
-            return
-
-        status = status_item.text()
-        file_path = file_item.text()
-
-        # 只有未暂存和修改的文件才显示差异
-        if status not in ["未暂存", "修改", "未跟踪"]:
-            self.log_message(f"文件 {file_path} 状态为 {status}，无需显示差异")
-            return
-
-        def on_diff_result(diff_content):
-            dialog = DiffDialog(file_path, diff_content, self)
-            dialog.exec_()
-
-        def on_diff_error(error_msg):
-            self.log_message(f"获取文件差异失败: {error_msg}")
-            QMessageBox.critical(self, "错误", f"获取文件差异失败: {error_msg}")
-
-        # 执行差异获取任务
-        worker = GitWorker(self.current_repo_path, "diff", file_path)
-        worker.signals.result.connect(on_diff_result)
-        worker.signals.error.connect(on_diff_error)
-        self.threadpool.start(worker)
+        self.show_file_diff_at_row(index.row())
 
     def show_status_context_menu(self, position):
         """显示文件状态右键菜单"""
-        item = self.status_table.itemAt(position)
-        if not item:
+        index = self.status_table.indexAt(position)
+        if not index.isValid():
             return
 
         # 获取行号
-        row = item.row()
+        row = index.row()
         # 获取文件状态和路径
-        status_item = self.status_table.item(row, 0)
-        file_item = self.status_table.item(row, 1)
-
-        if not status_item or not file_item:
+        row_data = self.status_model.row_data(row)
+        if not row_data:
             return
 
-        status = status_item.text()
-        file_path = file_item.text()
+        # 记下弹出时的文件而不是行号，菜单显示期间状态表可能被刷新
+        status, file_path, _ = row_data
+        self._menu_file = (status, file_path)
 
-        # 创建菜单
-        menu = QMenu()
+        # 只有未暂存和修改的文件才能取消变更，所有文件都可以查看差异
+        cancellable = status in _REVERTIBLE_STATUSES
+        self._cancel_action.setVisible(cancellable)
+        self._cancel_separator.setVisible(cancellable)
 
-        # 只有未暂存和修改的文件才能取消变更
-        if status in ["未暂存", "修改"]:
-            cancel_action = QAction("取消变更", self)
-            cancel_action.triggered.connect(lambda: self.cancel_file_changes(file_path))
-            menu.addAction(cancel_action)
-            menu.addSeparator()
+        self._row_menu.exec_(self.status_table.mapToGlobal(position))
 
-        # 所有文件都可以查看差异
-        diff_action = QAction("查看差异", self)
-        diff_action.triggered.connect(lambda: self.show_file_diff_at_row(row))
-        menu.addAction(diff_action)
+    def _on_cancel_current_row(self):
+        if self._menu_file:
+            self.cancel_file_changes(self._menu_file[1])
 
-        menu.exec_(self.status_table.mapToGlobal(position))
+    def _on_diff_current_row(self):
+        if self._menu_file:
+            self.show_file_diff_for(*self._menu_file)
 
     def show_file_diff_at_row(self, row):
         """在指定行显示文件差异"""
         # 获取文件状态和路径
-        status_item = self.status_table.item(row, 0)
-        file_item = self.status_table.item(row, 1)
-
-        if not status_item or not file_item:
+        row_data = self.status_model.row_data(row)
+        if row_data:
+            self.show_file_diff_for(row_data[0], row_data[1])
+
+    def show_file_diff_for(self, status, file_path):
+        """显示指定状态文件的差异"""
+        # 只有未暂存、修改和未跟踪的文件才显示差异
+        untracked = _DIFF_STATUSES.get(status)
+        if untracked is None:
+            self.log_message(f"文件 {file_path} 状态为 {status}，无需显示差异")
             return
 
-        status = status_item.text()
-        file_path = file_item.text()
-
-        # 只有未暂存和修改的文件才显示差异
-        if status not in ["未暂存", "修改", "未跟踪"]:
-            self.log_message(f"文件 {file_path} 状态为 {status}，无需显示差异")
+        # 文件内容未变化时复用上次获取的差异（HEAD 变化时写操作会清空缓存）
+        repo_path = self.current_repo_path
+        try:
+            file_stat = os.stat(os.path.join(repo_path, file_path))
+            diff_key = (file_path, file_stat.st_mtime_ns, file_stat.st_size)
+        except OSError:
+            diff_key = (file_path, None, None)
+
+        cached = self._cache_get(repo_path, "diff", diff_key, _DIFF_CACHE_TTL)
+        if cached is not None:
+            DiffDialog(file_path, cached, self).exec_()
             return
 
-        def on_diff_result(diff_content):
-            dialog = DiffDialog(file_path, diff_content, self)
-            dialog.exec_()
+        # 先打开对话框，差异输出分块到达时逐块追加
+        dialog = DiffDialog(file_path, None, self)
+        # 只缓存较小的差异，大差异不在内存中保留第二份
+        chunks = []
+        received = 0
+
+        def on_diff_chunk(text):
+            nonlocal chunks, received
+            dialog.append_text(text)
+            received += len(text)
+            if received > _DIFF_CACHE_MAX_CHARS:
+                chunks = None
+            elif chunks is not None:
+                chunks.append(text)
+
+        def on_diff_result(_total):
+            dialog.finish_stream()
+            if chunks is not None:
+                self._cache_put(repo_path, "diff", diff_key, "".join(chunks))
 
         def on_diff_error(error_msg):
+            dialog.reject()
             self.log_message(f"获取文件差异失败: {error_msg}")
             QMessageBox.critical(self, "错误", f"获取文件差异失败: {error_msg}")
 
         # 执行差异获取任务
-        worker = GitWorker(self.current_repo_path, "diff", file_path)
-        worker.signals.result.connect(on_diff_result)
-        worker.signals.error.connect(on_diff_error)
-        self.threadpool.start(worker)
+        self.start_git_worker("diff", file_path, untracked, on_result=on_diff_result,
+                              on_error=on_diff_error, on_chunk=on_diff_chunk)
+        dialog.exec_()
+
+    def ask_question(self, title, text, buttons, on_answer):
+        """非阻塞地询问用户：对话框以窗口模态打开，不进入嵌套事件循环，用户选择后以所选按钮回调"""
+        box = QMessageBox(QMessageBox.Question, title, text, buttons, self)
+        box.finished.connect(on_answer)
+        box.finished.connect(box.deleteLater)
+        box.open()
 
     def cancel_file_changes(self, file_path):
         """取消文件变更"""
-        reply = QMessageBox.question(
-            self,
-            "确认取消变更",
-            f"确定要取消文件 '{file_path}' 的变更吗？这将丢弃所有未暂存的修改。",
-            QMessageBox.Yes | QMessageBox.No
-        )
+        def on_answer(reply):
+            if reply != QMessageBox.Yes:
+                return
 
-        if reply == QMessageBox.Yes:
             def on_checkout_result(result):
                 self.log_message(result)
-                self.refresh_status()
+                self.schedule_refresh(_REFRESH_STATUS)
 
             def on_checkout_error(error_msg):
                 self.log_message(f"取消文件变更失败: {error_msg}")
                 QMessageBox.critical(self, "错误", f"取消文件变更失败: {error_msg}")
 
             # 执行取消变更任务
-            worker = GitWorker(self.current_repo_path, "checkout_file", file_path)
-            worker.signals.result.connect(on_checkout_result)
-            worker.signals.error.connect(on_checkout_error)
-            self.threadpool.start(worker)
+            self.start_git_worker("checkout_file", file_path, on_result=on_checkout_result, on_error=on_checkout_error)
+
+        self.ask_question(
+            "确认取消变更",
+            f"确定要取消文件 '{file_path}' 的变更吗？这将丢弃所有未暂存的修改。",
+            QMessageBox.Yes | QMessageBox.No,
+            on_answer
+        )
 
     def clone_repo(self):
         """克隆远程仓库"""
-        if "clone_repo" in self.active_operations:
+        if self._active & Op.CLONE_REPO:
             return
 
         # 创建克隆对话框
         dialog = CloneDialog(self)
         if dialog.exec_() == QDialog.Accepted:
-            self.active_operations.add("clone_repo")
+            self._active |= Op.CLONE_REPO
             self.set_button_loading(self.clone_repo_btn, True)
 
             # 创建克隆工作线程
-            worker = CloneWorker(dialog.repo_url, dialog.local_path, dialog.clone_target_path)
-            worker.signals.result.connect(self.on_clone_success)
-            worker.signals.error.connect(self.on_clone_error)
-            worker.signals.progress.connect(self.log_message)
-            self.threadpool.start(worker)
+            req_id = self.register_request(self.on_clone_success, self.on_clone_error, self.log_message)
+            worker = CloneWorker(self.bus, req_id, dialog.repo_url, dialog.local_path,
+                                 dialog.clone_target_path, dialog.clone_options)
+            self.net_threadpool.start(worker, _DEFAULT_PRIORITY)
 
     def on_clone_success(self, result):
         """克隆成功回调"""
-        self.log_message(result)
+        self.log_message(result.message)
         # 将克隆的仓库添加到配置中
-        repo_path = result.split(": ")[-1]  # 提取路径
+        repo_path = result.local_path
         if repo_path not in self.repo_paths:
             self.repo_paths.append(repo_path)
-            self.save_config()
+            self.journal_repo_change("add", repo_path)
             self.update_repo_list()
-        self.active_operations.discard("clone_repo")
+        self._active &= ~Op.CLONE_REPO
         self.set_button_loading(self.clone_repo_btn, False)
 
     def on_clone_error(self, error_msg):
         """克隆失败回调"""
         self.log_message(f"克隆失败: {error_msg}")
         QMessageBox.critical(self, "克隆失败", f"克隆仓库时出错: {error_msg}")
-        self.active_operations.discard("clone_repo")
+        self._active &= ~Op.CLONE_REPO
         self.set_button_loading(self.clone_repo_btn, False)
 
     def delete_branch(self):
@@ -1724,10 +2911,10 @@ class GitManager(QWidget):
         if not self.current_repo:
             return
 
-        local_branches = [branch.name for branch in self.current_repo.branches]
-        active_branch = self.current_repo.active_branch.name
+        branches = self._cached_local_branches()
 
         # 移除当前分支（不能删除当前分支）
+        local_branches, active_branch = branches
         branches_to_delete = [branch for branch in local_branches if branch != active_branch]
 
         if not branches_to_delete:
@@ -1735,49 +2922,48 @@ class GitManager(QWidget):
             return
 
         # 让用户选择要删除的分支
-        branch_to_delete, ok = QInputDialog.getItem(
-            self,
-            "删除分支",
-            "选择要删除的分支:",
-            branches_to_delete,
-            0,
-            False
-        )
-
-        if not ok or not branch_to_delete:
+        dialog = QInputDialog(self)
+        dialog.setWindowTitle("删除分支")
+        dialog.setLabelText("选择要删除的分支:")
+        dialog.setComboBoxItems(branches_to_delete)
+        dialog.setComboBoxEditable(False)
+        if dialog.exec_() != QDialog.Accepted:
             return
-
-        # 询问是否强制删除
-        force_delete = QMessageBox.question(
-            self,
-            "确认删除",
-            f"确定要删除分支 '{branch_to_delete}' 吗？\n\n"
-            "点击'是'进行普通删除，点击'否'进行强制删除，点击'取消'取消操作。",
-            QMessageBox.Yes | QMessageBox.No | QMessageBox.Cancel
-        )
-
-        if force_delete == QMessageBox.Cancel:
+        branch_to_delete = dialog.textValue()
+        if not branch_to_delete:
             return
 
-        force = (force_delete == QMessageBox.No)
-
         def on_delete_branch_result(result):
             self.log_message(result)
             # 刷新分支信息
-            self.refresh_branches()
+            self.schedule_refresh(_REFRESH_BRANCHES)
 
         def on_delete_branch_error(error_msg):
             self.log_message(f"删除分支失败: {error_msg}")
             QMessageBox.critical(self, "错误", f"删除分支失败: {error_msg}")
 
-        # 执行删除分支任务
-        worker = GitWorker(self.current_repo_path, "delete_branch", branch_to_delete, force)
-        worker.signals.result.connect(on_delete_branch_result)
-        worker.signals.error.connect(on_delete_branch_error)
-        self.threadpool.start(worker)
+        def on_answer(force_delete):
+            if force_delete not in (QMessageBox.Yes, QMessageBox.No):
+                return
+
+            force = (force_delete == QMessageBox.No)
+
+            # 执行删除分支任务
+            self.start_git_worker("delete_branch", branch_to_delete, force, on_result=on_delete_branch_result, on_error=on_delete_branch_error)
+
+        # 询问是否强制删除
+        self.ask_question(
+            "确认删除",
+            f"确定要删除分支 '{branch_to_delete}' 吗？\n\n"
+            "点击'是'进行普通删除，点击'否'进行强制删除，点击'取消'取消操作。",
+            QMessageBox.Yes | QMessageBox.No | QMessageBox.Cancel,
+            on_answer
+        )
 
 
 if __name__ == "__main__":
+    if os.environ.get("GIT_GUI_DEBUG"):
+        logging.basicConfig(level=logging.DEBUG)
     app = QApplication(sys.argv)
     # 设置应用程序样式以提高兼容性
     app.setStyle("Fusion")